@@ -0,0 +1,449 @@
+"""
+Reconocimiento Paralelo por Trozos de una Cadena muy Larga
+
+Este módulo reparte el análisis SLR(1) de una sola cadena enorme entre varios
+procesos. La cadena se divide en trozos y cada trabajador resume su trozo sin
+conocer la pila con la que empieza:
+
+- Arranque especulativo: un trozo que empieza en la posición i solo puede
+  comenzar en un estado al que se llega desplazando el símbolo i - 1, así que
+  se simula el autómata desde todos esos estados a la vez.
+- Resumen del efecto sobre la pila: cada configuración simulada sustituye los
+  d estados superiores de la pila real por una pila local. Si una reducción
+  desapila por debajo de lo conocido, el destino de IR_A depende de un estado
+  desconocido; la simulación se ramifica sobre los estados con transición por
+  ese no terminal y anota la restricción (profundidad, estado) de cada rama.
+  Las ramas cuyo estado no tiene transición hacia el estado ya exigido justo
+  encima se descartan, pues no pueden darse en una pila real.
+- Las configuraciones que llegan a la misma (d, pila local) se fusionan,
+  conservando la lista de restricciones alternativas de cada una.
+
+El proceso principal compone los resúmenes de izquierda a derecha: con la pila
+real busca la alternativa cuyas restricciones se cumplen y aplica su efecto.
+Si la especulación de un trozo crece por encima de `max_alternativas`, el
+trabajador renuncia y ese trozo se analiza secuencialmente. Antes de repartir
+la cadena se mide la especulación sobre una muestra; si cuesta más que los
+procesos disponibles, la cadena entera se analiza secuencialmente. El
+resultado es siempre el de `AnalizadorSLR1.analizar`.
+
+Las tablas se publican una vez en memoria compartida (ver `TablaCompartida`),
+y la entrada se codifica como un byte por símbolo en otro bloque compartido.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import TablaCompartida
+from TablaComprimida import ACEPTAR, ERROR
+
+# Código de los caracteres que no son terminales (la entrada usa un byte por símbolo).
+DESCONOCIDO = 255
+
+# Estado de cada proceso trabajador: tabla adjunta y datos de especulación.
+_trabajador = {}
+
+
+def _iniciar_trabajador(nombre_tabla, llegadas, origenes, predecesores, max_alternativas):
+    """Adjunta el proceso trabajador a la tabla publicada."""
+    _trabajador['tabla'] = TablaCompartida.adjuntar_memoria_compartida(nombre_tabla)
+    _trabajador['llegadas'] = llegadas
+    _trabajador['origenes'] = origenes
+    _trabajador['predecesores'] = predecesores
+    _trabajador['max_alternativas'] = max_alternativas
+
+
+def _resumir_trozo(nombre_entrada, inicio, fin):
+    """
+    Resume un trozo de la entrada publicada dentro de un proceso trabajador.
+
+    El trozo se copia y el bloque de entrada se cierra antes de resumir, de modo
+    que ningún trabajador lo mantiene proyectado cuando el padre lo destruye.
+
+    Returns:
+        tuple: El resumen (ver `resumir`) y los segundos de CPU empleados en calcularlo.
+    """
+    bloque = TablaCompartida.adjuntar_bloque(nombre_entrada)
+    try:
+        tokens = bytes(bloque.buf[inicio:fin])
+        anterior = bloque.buf[inicio - 1] if inicio else None
+    finally:
+        bloque.close()
+    inicio_reloj = time.process_time()
+    resumen = resumir(_trabajador['tabla'], tokens, anterior, _trabajador['llegadas'],
+                      _trabajador['origenes'], _trabajador['predecesores'],
+                      _trabajador['max_alternativas'])
+    return resumen, time.process_time() - inicio_reloj
+
+
+def resumir(tabla, tokens, anterior, llegadas, origenes, predecesores, max_alternativas):
+    """
+    Calcula el resumen de un trozo simulando todos sus arranques posibles.
+
+    Args:
+        tabla (TablaComprimida): Las tablas empaquetadas.
+        tokens (bytes): Los ids de terminal del trozo.
+        anterior (int): El id del símbolo previo al trozo, o None si el trozo
+            empieza la cadena (se arranca entonces desde el estado 0).
+        llegadas (list[list[int]]): Para cada terminal, los estados a los que se
+            llega desplazándolo.
+        origenes (list[list[tuple]]): Para cada no terminal, los pares
+            (estado, destino) de IR_A.
+        predecesores (list[set]): Para cada estado, los estados con alguna
+            transición hacia él.
+        max_alternativas (int): Límite de alternativas vivas antes de renunciar.
+
+    Returns:
+        list: Pares (alternativas, resultado), donde `alternativas` es una lista
+        de restricciones {profundidad: estado} sobre la pila real y `resultado`
+        es ('sigue', d, pila_local) o ('fin', veredicto). None si la
+        especulación superó el límite.
+    """
+    consistente, por_defecto = tabla.consistente, tabla.por_defecto
+    longitud, lado_izquierdo = tabla.longitud, tabla.lado_izquierdo
+    fila_estado, base, control, valor = tabla.fila_estado, tabla.base, tabla.control, tabla.valor
+    ir_a = tabla.ir_a
+
+    # Cada configuración es (d, pila_local, alternativas): la pila local sustituye
+    # a los d estados superiores de la pila real.
+    iniciales = [0] if anterior is None else llegadas[anterior]
+    configuraciones = [(1, [s], [{0: s}]) for s in iniciales]
+    vivas = len(configuraciones)
+    finales = []
+
+    for t in tokens:
+        siguientes = {}
+        pendientes = configuraciones
+        while pendientes:
+            desapilados, locales, alternativas = pendientes.pop()
+            while True:
+                estado = locales[-1]
+                if consistente[estado]:
+                    codigo = por_defecto[estado]
+                elif t == DESCONOCIDO:
+                    codigo = ERROR
+                else:
+                    # Consulta de ACCION sobre los vectores empaquetados (ver `TablaComprimida.accion`).
+                    fila = fila_estado[estado]
+                    i = base[fila] + t
+                    codigo = valor[i] if control[i] == fila else por_defecto[estado]
+
+                if codigo > 0:
+                    locales.append(codigo - 1)
+                    clave = (desapilados, tuple(locales))
+                    if clave in siguientes:
+                        siguientes[clave][2].extend(alternativas)
+                    else:
+                        siguientes[clave] = (desapilados, locales, alternativas)
+                    break
+
+                if codigo == ACEPTAR or codigo == ERROR:
+                    finales.append((alternativas, ('fin', codigo == ACEPTAR)))
+                    vivas -= len(alternativas)
+                    break
+
+                p = -codigo - 2
+                no_terminal = lado_izquierdo[p]
+                if longitud[p] < len(locales):
+                    del locales[len(locales) - longitud[p]:]
+                    locales.append(ir_a(locales[-1], no_terminal))
+                    continue
+
+                # La reducción llega a la pila real: el estado descubierto solo se
+                # conoce en las alternativas que ya lo restringen.
+                desapilados += longitud[p] - len(locales)
+                grupos = {}
+                for requeridos in alternativas:
+                    grupos.setdefault(requeridos.get(desapilados), []).append(requeridos)
+                for estado_real, grupo in grupos.items():
+                    if estado_real is not None:
+                        pendientes.append((desapilados, [ir_a(estado_real, no_terminal)], grupo))
+                        continue
+                    # En la pila real, cada estado tiene una transición hacia el de
+                    # encima: se descartan los orígenes incompatibles con él.
+                    vivas -= len(grupo)
+                    for origen, destino in origenes[no_terminal]:
+                        ramas = [{**requeridos, desapilados: origen} for requeridos in grupo
+                                 if desapilados - 1 not in requeridos
+                                 or origen in predecesores[requeridos[desapilados - 1]]]
+                        if ramas:
+                            vivas += len(ramas)
+                            pendientes.append((desapilados, [destino], ramas))
+                    if vivas > max_alternativas:
+                        return None
+                break
+
+        configuraciones = list(siguientes.values())
+
+    return finales + [(alternativas, ('sigue', desapilados, locales))
+                      for desapilados, locales, alternativas in configuraciones]
+
+
+def _coincide(pila, requeridos):
+    """Indica si la pila real cumple todas las restricciones de una alternativa."""
+    return all(p < len(pila) and pila[-1 - p] == estado for p, estado in requeridos.items())
+
+
+def _componer(pila, resumen):
+    """
+    Aplica a la pila real el resumen de un trozo.
+
+    Returns:
+        tuple: (aplicado, veredicto). `aplicado` es False si ninguna alternativa
+        coincide; `veredicto` es None si el análisis debe continuar.
+    """
+    for alternativas, resultado in resumen:
+        if any(_coincide(pila, requeridos) for requeridos in alternativas):
+            if resultado[0] == 'fin':
+                return True, resultado[1]
+            _, desapilados, locales = resultado
+            del pila[len(pila) - desapilados:]
+            pila.extend(locales)
+            return True, None
+    return False, None
+
+
+def _continuar(tabla, pila, tokens):
+    """
+    Avanza secuencialmente sobre unos tokens a partir de la pila real.
+
+    Sigue el mismo algoritmo que `TablaComprimida.analizar`.
+
+    Returns:
+        bool: El veredicto si se decide dentro de los tokens; None si no.
+    """
+    consistente, por_defecto = tabla.consistente, tabla.por_defecto
+    longitud, lado_izquierdo = tabla.longitud, tabla.lado_izquierdo
+    for t in tokens:
+        while True:
+            estado = pila[-1]
+            if consistente[estado]:
+                codigo = por_defecto[estado]
+            elif t == DESCONOCIDO:
+                return False  # Error: símbolo fuera del alfabeto.
+            else:
+                codigo = tabla.accion(estado, t)
+
+            if codigo > 0:
+                pila.append(codigo - 1)
+                break
+            if codigo == ACEPTAR:
+                return True
+            if codigo == ERROR:
+                return False
+            p = -codigo - 2
+            if longitud[p]:
+                del pila[-longitud[p]:]
+            pila.append(tabla.ir_a(pila[-1], lado_izquierdo[p]))
+    return None
+
+
+class AnalizadorParalelo:
+    """
+    Reconocedor SLR(1) que reparte una cadena muy larga entre varios procesos.
+
+    Debe cerrarse con `cerrar` (o usarse en un bloque `with`) para terminar los
+    procesos y liberar la memoria compartida.
+
+    Atributos:
+        tabla (TablaComprimida): Las tablas empaquetadas del analizador.
+        procesos (int): Número de procesos trabajadores.
+        tamaño_trozo (int): Longitud aproximada de cada trozo.
+        max_alternativas (int): Límite de especulación por trozo.
+        informe (dict): Datos del último análisis: longitud, trozos, trozos
+            analizados secuencialmente, modo, segundos empleados, coste de la
+            especulación (cuántas veces el tiempo del análisis directo cuesta
+            resumir la entrada) y aceleración estimada frente al análisis directo
+            ('aceleracion_estimada': extrapola el tiempo del análisis directo
+            desde la muestra inicial, sin ejecutarlo).
+    """
+    def __init__(self, analizador, procesos=None, tamaño_trozo=1 << 20, max_alternativas=256):
+        """
+        Prepara las tablas y los datos de especulación a partir de un `AnalizadorSLR1`.
+
+        Args:
+            analizador: Un `AnalizadorSLR1` cuyas tablas ya fueron construidas.
+            procesos (int, opcional): Número de trabajadores; por defecto, uno por CPU.
+            tamaño_trozo (int): Longitud aproximada de cada trozo.
+            max_alternativas (int): Alternativas vivas por trozo antes de renunciar.
+        """
+        self.analizador = analizador
+        self.tabla = analizador.tabla_comprimida or analizador.comprimir_tabla()
+        self.procesos = procesos or os.cpu_count() or 1
+        self.tamaño_trozo = tamaño_trozo
+        self.max_alternativas = max_alternativas
+        self.informe = {}
+        self._bloque_tabla = None
+        self._ejecutor = None
+
+        id_terminal = self.tabla.id_terminal
+        self.llegadas = [[] for _ in range(DESCONOCIDO + 1)]
+        for (estado, terminal), entrada in analizador.accion.items():
+            if entrada != 'aceptar' and entrada[0] == 'desplazar':
+                self.llegadas[id_terminal[terminal]].append(entrada[1])
+        self.origenes = [[] for _ in self.tabla.no_terminales]
+        for (estado, no_terminal), destino in analizador.ir_a.items():
+            self.origenes[self.tabla.id_no_terminal[no_terminal]].append((estado, destino))
+        self.predecesores = [set() for _ in analizador.estados]
+        for estado in analizador.estados:
+            for destino in estado.transiciones.values():
+                self.predecesores[destino].add(estado.id_estado)
+
+        # Traducción de cada carácter (un byte en latin-1) a su id de terminal.
+        self._traduccion = None
+        if len(id_terminal) < DESCONOCIDO:
+            self._traduccion = bytes(id_terminal.get(chr(c), DESCONOCIDO) for c in range(256))
+
+    def _codificar(self, cadena_entrada):
+        """Codifica la cadena con un byte por símbolo, o devuelve None si no es posible."""
+        if self._traduccion is None:
+            return None
+        try:
+            return cadena_entrada.encode('latin-1').translate(self._traduccion)
+        except UnicodeEncodeError:
+            return None
+
+    def _fronteras(self, tokens):
+        """
+        Elige los puntos de corte entre trozos.
+
+        Cerca de cada corte nominal se elige la posición cuyo símbolo previo
+        lleva al menor número de estados, para reducir la especulación.
+
+        Returns:
+            list[tuple]: Los trozos como pares (inicio, fin).
+        """
+        ventana = max(1, min(1024, self.tamaño_trozo // 4))
+        cortes = [0]
+        for nominal in range(self.tamaño_trozo, len(tokens) - ventana, self.tamaño_trozo):
+            mejor = min(range(nominal, nominal + ventana),
+                        key=lambda i: len(self.llegadas[tokens[i - 1]]) or float('inf'))
+            cortes.append(mejor)
+        cortes.append(len(tokens))
+        return list(zip(cortes, cortes[1:]))
+
+    def _iniciar(self):
+        """Publica las tablas y arranca los procesos trabajadores, si aún no se hizo."""
+        if self._ejecutor is None:
+            self._bloque_tabla = TablaCompartida.publicar_memoria_compartida(self.tabla)
+            self._ejecutor = ProcessPoolExecutor(
+                max_workers=self.procesos, initializer=_iniciar_trabajador,
+                initargs=(self._bloque_tabla.name, self.llegadas, self.origenes,
+                          self.predecesores, self.max_alternativas))
+            # Con fork, los procesos se crean en el primer envío: si ese envío
+            # ya es un trozo, heredan proyectado el bloque de entrada del padre.
+            self._ejecutor.submit(int).result()
+
+    def analizar(self, cadena_entrada):
+        """
+        Analiza una cadena repartiendo sus trozos entre los procesos.
+
+        Las cadenas de menos de dos trozos, o que no pueden codificarse con un
+        byte por símbolo, se analizan secuencialmente; también todas si solo hay
+        un proceso, o si la especulación medida sobre una muestra (ver
+        `_medir_muestra`) cuesta tantas veces el análisis directo como procesos
+        pueden trabajar a la vez.
+
+        Args:
+            cadena_entrada (str): La cadena a analizar.
+
+        Returns:
+            bool: True si la cadena es aceptada, False si no.
+        """
+        inicio_reloj = time.perf_counter()
+        self.informe = {'longitud': len(cadena_entrada), 'trozos': 1,
+                        'trozos_secuenciales': 0, 'modo': 'secuencial',
+                        'especulacion': 1.0, 'aceleracion_estimada': 1.0}
+        tokens = self._codificar(cadena_entrada)
+        trozos = None
+        if (self.analizador.es_slr1 and tokens is not None and self.procesos >= 2
+                and len(tokens) >= 2 * self.tamaño_trozo):
+            trozos = self._fronteras(tokens)
+            especulacion, segundos_por_simbolo = self._medir_muestra(tokens, trozos[1][0])
+            self.informe['especulacion'] = especulacion
+            if especulacion >= min(self.procesos, len(trozos)):
+                trozos = None
+        if trozos is None:
+            veredicto = self.tabla.analizar(cadena_entrada)
+            self.informe['segundos'] = time.perf_counter() - inicio_reloj
+            return veredicto
+
+        self._iniciar()
+        self.informe.update(trozos=len(trozos), modo='paralelo')
+        entrada = TablaCompartida.crear_bloque(len(tokens))
+        futuros = []
+        try:
+            entrada.buf[:len(tokens)] = tokens
+            futuros = [self._ejecutor.submit(_resumir_trozo, entrada.name, inicio, fin)
+                       for inicio, fin in trozos]
+            veredicto = self._componer_trozos(tokens, trozos, futuros, segundos_por_simbolo)
+        finally:
+            for futuro in futuros:
+                futuro.cancel()
+            TablaCompartida.destruir_bloque(entrada)
+        segundos = self.informe['segundos'] = time.perf_counter() - inicio_reloj
+        self.informe['aceleracion_estimada'] = segundos_por_simbolo * len(tokens) / segundos
+        return veredicto
+
+    def _medir_muestra(self, tokens, inicio):
+        """
+        Estima el coste de la especulación sobre una muestra de la entrada.
+
+        La muestra empieza en un corte entre trozos, como la que recibiría un
+        trabajador; el análisis directo se cronometra sobre el comienzo de la
+        cadena, donde la pila real es conocida.
+
+        Returns:
+            tuple: Cuántas veces el tiempo del análisis directo cuesta resumir la
+            muestra (infinito si la especulación superó el límite) y segundos por
+            símbolo del análisis directo.
+        """
+        muestra = min(self.tamaño_trozo, 4096)
+        inicio_reloj = time.process_time()
+        _continuar(self.tabla, [0], tokens[:muestra])
+        segundos_directo = max(time.process_time() - inicio_reloj, 1e-9)
+        inicio_reloj = time.process_time()
+        resumen = resumir(self.tabla, tokens[inicio:inicio + muestra], tokens[inicio - 1],
+                          self.llegadas, self.origenes, self.predecesores, self.max_alternativas)
+        segundos_especulativo = time.process_time() - inicio_reloj
+        if resumen is None:
+            return float('inf'), segundos_directo / muestra
+        return segundos_especulativo / segundos_directo, segundos_directo / muestra
+
+    def _componer_trozos(self, tokens, trozos, futuros, segundos_por_simbolo):
+        """
+        Compone los resúmenes en orden, analizando secuencialmente los que faltan.
+
+        Con los segundos de CPU de cada trabajador y `segundos_por_simbolo` del
+        análisis directo, actualiza el coste de la especulación en `informe`.
+        """
+        pila = [0]
+        segundos = 0.0
+        for (inicio, fin), futuro in zip(trozos, futuros):
+            resumen, segundos_trozo = futuro.result()
+            segundos += segundos_trozo
+            self.informe['especulacion'] = segundos / (fin * segundos_por_simbolo)
+            aplicado, veredicto = _componer(pila, resumen) if resumen is not None else (False, None)
+            if not aplicado:
+                self.informe['trozos_secuenciales'] += 1
+                veredicto = _continuar(self.tabla, pila, tokens[inicio:fin])
+            if veredicto is not None:
+                return veredicto
+        return _continuar(self.tabla, pila, [self.tabla.id_terminal['$']]) is True
+
+    def cerrar(self):
+        """Termina los procesos trabajadores y destruye el bloque de las tablas."""
+        if self._ejecutor is not None:
+            self._ejecutor.shutdown(cancel_futures=True)
+            self._ejecutor = None
+        if self._bloque_tabla is not None:
+            TablaCompartida.destruir_bloque(self._bloque_tabla)
+            self._bloque_tabla = None
+
+    def __enter__(self):
+        """Permite usar el analizador en un bloque `with`."""
+        return self
+
+    def __exit__(self, *excepcion):
+        """Cierra el analizador al salir del bloque `with`."""
+        self.cerrar()
@@ -0,0 +1,241 @@
+"""
+Análisis por Lotes con Prefijos Compartidos
+
+Este módulo analiza lotes de cadenas que comparten prefijos largos (casos de
+prueba generados, líneas de registro con la misma cabecera...). Como los
+analizadores LL(1) y SLR(1) son deterministas, la pila tras consumir un prefijo
+es siempre la misma, así que no hace falta repetir ese trabajo para cada cadena.
+
+- Las cadenas se ordenan; recorrerlas en orden equivale a recorrer en
+  profundidad el trie que forman, y el prefijo común con la cadena anterior
+  indica en qué nodo del camino actual se ramifica la siguiente.
+- Las pilas son persistentes (celdas enlazadas (tope, resto)): guardar la pila
+  de cada nodo del camino y volver a ella al ramificar no copia nada.
+- Cuando un prefijo ya decide el veredicto (un error, o la aceptación ante un
+  '$' dentro de la cadena), todo el subárbol que cuelga de él recibe ese
+  veredicto sin analizarse.
+
+Así, el número de pasos del analizador es proporcional al tamaño del trie y
+no a la suma de las longitudes de las cadenas.
+"""
+
+
+def _recorrer_trie(cadenas, pila_inicial, avanzar, terminar):
+    """
+    Recorre en profundidad el trie de un lote, común a LL(1) y SLR(1).
+
+    Args:
+        cadenas (list[str]): Las cadenas a analizar.
+        pila_inicial (tuple): La pila persistente con la que empieza todo análisis.
+        avanzar (callable): Consume un símbolo: `avanzar(pila, simbolo)` devuelve la
+            nueva pila y el veredicto, o None si el prefijo aún no lo decide.
+        terminar (callable): Procesa el '$' final y devuelve el veredicto de la cadena.
+
+    Returns:
+        tuple: El veredicto de cada cadena, en el orden de entrada, y el número de
+            símbolos consumidos (nodos del trie visitados).
+    """
+    resultado = [False] * len(cadenas)
+    pasos = 0
+
+    # `camino[d]` es la pila tras consumir los d primeros símbolos del camino
+    # actual; `corte` es (profundidad, veredicto) si el camino quedó decidido.
+    camino = [pila_inicial]
+    corte = None
+    anterior = None
+    veredicto = False
+
+    for i in sorted(range(len(cadenas)), key=cadenas.__getitem__):
+        cadena = cadenas[i]
+        if cadena == anterior:
+            resultado[i] = veredicto
+            continue
+
+        comun = _prefijo_comun(anterior, cadena) if anterior is not None else 0
+        anterior = cadena
+        if corte is not None and comun >= corte[0]:
+            veredicto = resultado[i] = corte[1]  # Subárbol ya decidido.
+            continue
+        corte = None
+        del camino[comun + 1:]
+
+        pila = camino[-1]
+        for profundidad in range(comun, len(cadena)):
+            pila, decidido = avanzar(pila, cadena[profundidad])
+            pasos += 1
+            if decidido is not None:
+                corte = (profundidad + 1, decidido)
+                break
+            camino.append(pila)
+
+        veredicto = resultado[i] = corte[1] if corte is not None else terminar(pila)
+    return resultado, pasos
+
+
+def _prefijo_comun(a, b):
+    """
+    Calcula la longitud del prefijo común de dos cadenas.
+
+    Usa una búsqueda binaria sobre comparaciones de subcadenas, que se hacen en
+    C, en lugar de comparar carácter a carácter.
+    """
+    bajo, alto = 0, min(len(a), len(b))
+    while bajo < alto:
+        medio = (bajo + alto + 1) // 2
+        if a[:medio] == b[:medio]:
+            bajo = medio
+        else:
+            alto = medio - 1
+    return bajo
+
+
+class PrefijosSLR1:
+    """
+    Análisis por prefijos compartidos a partir de un `AnalizadorSLR1`.
+
+    La pila de estados es una lista enlazada de tuplas (estado, resto). Tras
+    consumir un símbolo, la pila depende solo del prefijo leído: las reducciones
+    previas a cada desplazamiento se deciden con el propio símbolo.
+
+    Atributos:
+        pasos (int): Símbolos consumidos en el último lote (nodos del trie visitados).
+        longitud_total (int): Suma de las longitudes de las cadenas del último lote.
+    """
+    def __init__(self, analizador):
+        """Toma las tablas ACCION e IR_A del analizador."""
+        self.analizador = analizador
+        self.accion = analizador.accion
+        self.ir_a = analizador.ir_a
+        self.pasos = 0
+        self.longitud_total = 0
+
+    def analizar(self, cadenas):
+        """
+        Analiza un lote de cadenas compartiendo el trabajo de sus prefijos comunes.
+
+        La pila inicial contiene solo el estado 0.
+
+        Args:
+            cadenas (list[str]): Las cadenas a analizar.
+
+        Returns:
+            list[bool]: El veredicto de cada cadena, en el orden de entrada.
+        """
+        self.longitud_total = sum(map(len, cadenas))
+        if not self.analizador.es_slr1:
+            self.pasos = 0
+            return [False] * len(cadenas)
+        resultado, self.pasos = _recorrer_trie(cadenas, (0, None), self._avanzar, self._terminar)
+        return resultado
+
+    def _avanzar(self, pila, simbolo):
+        """Reduce mientras haga falta y desplaza el símbolo (ver `AnalizadorSLR1.analizar`)."""
+        accion_de, ir_a = self.accion, self.ir_a
+        while True:
+            accion = accion_de.get((pila[0], simbolo))
+            if accion is None:
+                return pila, False  # Error: acción no definida.
+            if accion == 'aceptar':
+                return pila, True
+            if accion[0] == 'desplazar':
+                return (accion[1], pila), None
+
+            no_terminal, produccion = accion[1], accion[2]
+            if produccion != ['e']:
+                for _ in produccion:
+                    pila = pila[1]
+            destino = ir_a.get((pila[0], no_terminal))
+            if destino is None:
+                return pila, False  # Error: transición IR_A no definida.
+            pila = (destino, pila)
+
+    def _terminar(self, pila):
+        """Procesa '$'; solo la aceptación da un veredicto positivo."""
+        return self._avanzar(pila, '$')[1] is True
+
+
+class PrefijosLL1:
+    """
+    Análisis por prefijos compartidos a partir de un `AnalizadorLL1`.
+
+    La pila de símbolos es una lista enlazada de tuplas (símbolo, resto); las
+    expansiones apilan el lado derecho sobre la pila compartida sin copiarla.
+
+    Atributos:
+        pasos (int): Símbolos consumidos en el último lote (nodos del trie visitados).
+        longitud_total (int): Suma de las longitudes de las cadenas del último lote.
+    """
+    def __init__(self, analizador):
+        """Toma la tabla de análisis y los conjuntos de símbolos del analizador."""
+        self.analizador = analizador
+        self.tabla_analisis = analizador.tabla_analisis
+        self.terminales = analizador.gramatica.terminales
+        self.no_terminales = analizador.gramatica.no_terminales
+        self.pasos = 0
+        self.longitud_total = 0
+
+    def analizar(self, cadenas):
+        """
+        Analiza un lote de cadenas compartiendo el trabajo de sus prefijos comunes.
+
+        La pila inicial contiene '$' y, sobre él, el símbolo inicial.
+
+        Args:
+            cadenas (list[str]): Las cadenas a analizar.
+
+        Returns:
+            list[bool]: El veredicto de cada cadena, en el orden de entrada.
+        """
+        self.longitud_total = sum(map(len, cadenas))
+        if not self.analizador.es_ll1:
+            self.pasos = 0
+            return [False] * len(cadenas)
+        pila_inicial = (self.analizador.gramatica.simbolo_inicial, ('$', None))
+        resultado, self.pasos = _recorrer_trie(cadenas, pila_inicial, self._avanzar, self._terminar)
+        return resultado
+
+    def _avanzar(self, pila, simbolo):
+        """Expande no terminales hasta que un terminal coincide con el símbolo (ver `AnalizadorLL1.analizar`)."""
+        while pila is not None:
+            tope = pila[0]
+            if tope in self.terminales or tope == '$':
+                if tope == simbolo:
+                    return pila[1], None
+                return pila, False  # Error: terminal no coincide.
+
+            if tope in self.no_terminales:
+                produccion = self.tabla_analisis.get((tope, simbolo))
+                if produccion is None:
+                    return pila, False  # Error: no hay producción en la tabla.
+                pila = pila[1]
+                if produccion != ['e']:
+                    for s in reversed(produccion):
+                        pila = (s, pila)
+            else:
+                return pila, False  # Símbolo inesperado en la pila.
+
+        # La pila se vació antes de consumir toda la entrada.
+        return pila, False
+
+    def _terminar(self, pila):
+        """Procesa '$': se acepta si con él se vacía la pila."""
+        pila, decidido = self._avanzar(pila, '$')
+        return decidido if decidido is not None else pila is None
+
+
+def analizar_con_prefijos(analizador, cadenas):
+    """
+    Analiza un lote de cadenas compartiendo el trabajo de sus prefijos comunes.
+
+    Args:
+        analizador: Un `AnalizadorSLR1` o `AnalizadorLL1` ya construido.
+        cadenas (list[str]): Las cadenas a analizar.
+
+    Returns:
+        list[bool]: El veredicto de cada cadena, en el orden de entrada.
+    """
+    if hasattr(analizador, 'accion'):
+        recorrido = PrefijosSLR1(analizador)
+    else:
+        recorrido = PrefijosLL1(analizador)
+    return recorrido.analizar(cadenas)
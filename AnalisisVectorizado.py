@@ -0,0 +1,362 @@
+"""
+Análisis por Lotes Vectorizado con NumPy
+
+Este módulo permite analizar muchas cadenas a la vez contra una misma gramática.
+En lugar de ejecutar el bucle de `analizar` una vez por cadena, todas las
+cadenas del lote avanzan al mismo paso ("lockstep"): en cada iteración se
+consulta una tabla densa con operaciones vectoriales de NumPy para todos los
+analizadores activos, y cada carril se retira en cuanto acepta o rechaza.
+
+- Las cadenas se codifican en una matriz 2-D de ids de terminal, rellenada con '$'.
+- Las pilas de todos los carriles viven en un vector plano preasignado (que
+  crece si hace falta) junto con un vector de alturas; cada paso se calcula sin
+  bifurcaciones para todos los carriles activos, que se compactan al retirarse.
+
+NumPy es una dependencia opcional: solo se necesita para usar este módulo.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+
+def requerir_numpy(funcionalidad="El análisis vectorizado"):
+    """
+    Verifica que NumPy esté disponible.
+
+    Args:
+        funcionalidad (str, opcional): Lo que necesita NumPy, para el mensaje de error.
+
+    Raises:
+        ImportError: Si NumPy no está instalado.
+    """
+    if np is None:
+        raise ImportError(f"{funcionalidad} requiere NumPy (pip install numpy).")
+
+
+def _codificar(cadenas, id_terminal, id_desconocido, id_fin):
+    """
+    Convierte un lote de cadenas en una matriz de ids de terminal.
+
+    Args:
+        cadenas (list[str]): Las cadenas del lote.
+        id_terminal (dict): Mapeo de terminal (un carácter) a su id.
+        id_desconocido (int): Id para los caracteres que no son terminales.
+        id_fin (int): Id del terminal '$', usado como relleno.
+
+    Returns:
+        tuple: La matriz de tokens (B x (Lmax + 1)) y el vector de longitudes.
+    """
+    longitudes = np.fromiter((len(c) for c in cadenas), dtype=np.int64, count=len(cadenas))
+    ancho = int(longitudes.max()) + 1 if len(cadenas) else 1
+    tokens = np.full((len(cadenas), ancho), id_fin, dtype=np.int32)
+
+    total = int(longitudes.sum())
+    if total:
+        # Todos los caracteres se traducen de una vez mediante una tabla por punto
+        # de código; los que quedan fuera de ella van a su última casilla.
+        puntos = np.frombuffer(''.join(cadenas).encode('utf-32-le'), dtype=np.uint32)
+        tabla = np.full(max(map(ord, id_terminal)) + 2, id_desconocido, dtype=np.int32)
+        for terminal, i in id_terminal.items():
+            tabla[ord(terminal)] = i
+        ids = tabla[np.minimum(puntos, len(tabla) - 1)]
+        del puntos
+
+        # Posición plana de cada carácter: el k-ésimo del total, que es el
+        # (k - inicio)-ésimo de su cadena, va a fila * ancho + k - inicio.
+        tipo = np.int32 if tokens.size < 2 ** 31 else np.int64
+        inicios = np.cumsum(longitudes) - longitudes
+        destinos = np.repeat((np.arange(len(cadenas)) * ancho - inicios).astype(tipo), longitudes)
+        destinos += np.arange(total, dtype=tipo)
+        tokens.ravel()[destinos] = ids
+
+    return tokens, longitudes
+
+
+# Carriles que `analizar_lote` analiza a la vez; acota la memoria de la matriz
+# de tokens y de las pilas en lotes de millones de cadenas.
+CARRILES_POR_LOTE = 1 << 16
+
+
+def _ampliar(pila, base, cima, capacidad):
+    """
+    Duplica la capacidad de las pilas, guardadas en un único vector plano.
+
+    Cada carril ocupa un hueco [k * capacidad, (k + 1) * capacidad), cuyo inicio
+    es `base`; `cima` es la posición absoluta del siguiente hueco libre. La
+    nueva pila solo tiene sitio para los carriles activos, que pasan a ocupar
+    los huecos 0, 1, 2...
+
+    Returns:
+        tuple: La nueva pila plana, las nuevas bases y cimas de los carriles
+        activos y la nueva capacidad.
+    """
+    nueva = np.zeros((base.size, capacidad * 2), dtype=pila.dtype)
+    nueva[:, :capacidad] = pila.reshape(-1, capacidad)[base // capacidad]
+    capacidad *= 2
+    nueva_base = np.arange(base.size) * capacidad
+    return nueva.ravel(), nueva_base, nueva_base + (cima - base), capacidad
+
+
+class LoteSLR1:
+    """
+    Analizador por lotes vectorizado a partir de un `AnalizadorSLR1`.
+
+    ACCION e IR_A se combinan en una sola matriz densa de ancho W, con las
+    columnas de los terminales (más una para los caracteres fuera del
+    alfabeto), las de los no terminales y una columna nula. Los estados se
+    guardan premultiplicados por W, de modo que cada consulta es una suma.
+
+    Codificación de las celdas de ACCION: 0 error, -1 aceptar, -(p + 2) reducir
+    por la producción p y j * W + 1 desplazar al estado j. Las celdas de IR_A
+    guardan j * W, o -1 si no están definidas.
+
+    Atributos:
+        tabla (ndarray): La matriz combinada, aplanada.
+        ancho (int): El ancho W de cada fila.
+        desapilar (ndarray): Símbolos a desapilar según -min(codigo, 0).
+        columna_ir_a (ndarray): Columna de IR_A a consultar según -min(codigo, 0);
+            la columna nula para error y aceptación.
+        es_slr1 (bool): Copia de la compatibilidad del analizador original.
+    """
+    def __init__(self, analizador):
+        """Construye la matriz combinada a partir de las tablas del analizador."""
+        requerir_numpy()
+        gramatica = analizador.gramatica
+        self.es_slr1 = analizador.es_slr1
+        terminales = sorted(gramatica.terminales)
+        no_terminales = sorted(gramatica.no_terminales)
+        self.id_terminal = {t: i for i, t in enumerate(terminales)}
+        inicio_ir_a = len(terminales) + 1
+        columna_no_terminal = {nt: inicio_ir_a + i for i, nt in enumerate(no_terminales)}
+        columna_nula = inicio_ir_a + len(no_terminales)
+        self.ancho = W = columna_nula + 1
+
+        tabla = np.zeros((len(analizador.estados), W), dtype=np.int64)
+        tabla[:, inicio_ir_a:] = -1
+        ids_produccion = {}
+        desapilar, columna_ir_a = [0, 0], [columna_nula, columna_nula]
+        for (estado, terminal), entrada in analizador.accion.items():
+            if entrada == 'aceptar':
+                codigo = -1
+            elif entrada[0] == 'desplazar':
+                codigo = entrada[1] * W + 1
+            else:
+                clave = (entrada[1], tuple(entrada[2]))
+                if clave not in ids_produccion:
+                    ids_produccion[clave] = len(ids_produccion)
+                    desapilar.append(0 if entrada[2] == ['e'] else len(entrada[2]))
+                    columna_ir_a.append(columna_no_terminal[entrada[1]])
+                codigo = -(ids_produccion[clave] + 2)
+            tabla[estado, self.id_terminal[terminal]] = codigo
+
+        for (estado, no_terminal), destino in analizador.ir_a.items():
+            tabla[estado, columna_no_terminal[no_terminal]] = destino * W
+
+        self.tabla = tabla.ravel()
+        self.desapilar = np.array(desapilar, dtype=np.int64)
+        self.columna_ir_a = np.array(columna_ir_a, dtype=np.int64)
+
+    def analizar(self, cadenas):
+        """
+        Analiza un lote de cadenas en paralelo, paso a paso.
+
+        Args:
+            cadenas (list[str]): Las cadenas a analizar.
+
+        Returns:
+            ndarray: Vector booleano con el veredicto de cada cadena.
+        """
+        resultado = np.zeros(len(cadenas), dtype=bool)
+        if not self.es_slr1 or not len(cadenas):
+            return resultado
+
+        tabla, desapilar, columna_ir_a = self.tabla, self.desapilar, self.columna_ir_a
+        tokens, _ = _codificar(cadenas, self.id_terminal,
+                               len(self.id_terminal), self.id_terminal['$'])
+        ancho_tokens = tokens.shape[1]
+        tokens = tokens.ravel()
+
+        # Estado de los carriles activos, compactado cada vez que alguno se retira.
+        activos = np.arange(len(cadenas))
+        posicion = activos * ancho_tokens
+        capacidad = 64
+        pila = np.zeros(len(cadenas) * capacidad, dtype=np.int64)
+        base = activos * capacidad
+        cima = base + 1
+        tope = np.zeros(len(cadenas), dtype=np.int64)
+        # La pila crece como mucho un símbolo por paso: la altura real solo se
+        # consulta cuando la holgura que dejaba la última consulta se agota.
+        holgura = capacidad - 2
+
+        while activos.size:
+            if holgura <= 0:
+                altura = int((cima - base).max())
+                if altura + 1 >= capacidad:
+                    pila, base, cima, capacidad = _ampliar(pila, base, cima, capacidad)
+                holgura = capacidad - 1 - altura
+            holgura -= 1
+
+            codigo = tabla[tope + tokens[posicion]]
+            desplaza = codigo > 0
+
+            # Una reducción desapila y consulta IR_A; un desplazamiento apila su destino.
+            indice = -np.minimum(codigo, 0)
+            cima -= desapilar[indice]
+            destino = np.where(desplaza, codigo - 1, tabla[pila[cima - 1] + columna_ir_a[indice]])
+            pila[cima] = destino
+            cima += 1
+            posicion += desplaza
+            tope = destino
+
+            # Error y aceptación llevan a la columna nula, cuyo destino es -1.
+            sigue = destino >= 0
+            if not sigue.all():
+                retirados = ~sigue
+                resultado[activos[retirados]] = codigo[retirados] == -1
+                activos, posicion, base, cima, tope = (
+                    activos[sigue], posicion[sigue], base[sigue], cima[sigue], tope[sigue])
+
+        return resultado
+
+
+class LoteLL1:
+    """
+    Analizador por lotes vectorizado a partir de un `AnalizadorLL1`.
+
+    Cada símbolo que puede aparecer en la pila tiene una fila en una matriz
+    densa de ancho W (un terminal más por los caracteres fuera del alfabeto):
+    - Fila de un no terminal A: el id de la producción M[A, a], o -1 si no hay.
+    - Fila de un terminal t: -2 ("coincide") en la columna t y -1 en el resto.
+    - Fila de cualquier otro símbolo: -1 (rechazo, igual que en `AnalizadorLL1.analizar`).
+    Los símbolos se guardan en la pila premultiplicados por W.
+
+    Atributos:
+        tabla (ndarray): La matriz de decisiones, aplanada.
+        ancho (int): El ancho W de cada fila.
+        lados_derechos (ndarray): Producciones invertidas, premultiplicadas y
+            rellenadas, P x máximo.
+        apilar (ndarray): Símbolos a apilar según codigo + 2.
+        es_ll1 (bool): Copia de la compatibilidad del analizador original.
+    """
+    def __init__(self, analizador):
+        """Construye la matriz de decisiones a partir de la tabla del analizador."""
+        requerir_numpy()
+        gramatica = analizador.gramatica
+        self.es_ll1 = analizador.es_ll1
+        terminales = sorted(gramatica.terminales)
+        no_terminales = sorted(gramatica.no_terminales)
+        self.id_terminal = {t: i for i, t in enumerate(terminales)}
+        id_simbolo = dict(self.id_terminal)
+        for i, nt in enumerate(no_terminales):
+            id_simbolo[nt] = len(terminales) + i
+        id_otro = len(terminales) + len(no_terminales)
+        self.ancho = W = len(terminales) + 1
+        self.simbolo_inicial = id_simbolo.get(gramatica.simbolo_inicial, id_otro) * W
+        self.fin = self.id_terminal['$'] * W
+
+        tabla = np.full((id_otro + 1, W), -1, dtype=np.int64)
+        for t in range(len(terminales)):
+            tabla[t, t] = -2
+        ids_produccion = {}
+        producciones = []
+        for (nt, terminal), produccion in analizador.tabla_analisis.items():
+            clave = (nt, tuple(produccion))
+            if clave not in ids_produccion:
+                ids_produccion[clave] = len(producciones)
+                simbolos = [] if produccion == ['e'] else list(reversed(produccion))
+                producciones.append([id_simbolo.get(s, id_otro) * W for s in simbolos])
+            tabla[id_simbolo[nt], self.id_terminal[terminal]] = ids_produccion[clave]
+        self.tabla = tabla.ravel()
+
+        maximo = max((len(p) for p in producciones), default=0)
+        self.lados_derechos = np.zeros((max(len(producciones), 1), max(maximo, 1)), dtype=np.int64)
+        for i, simbolos in enumerate(producciones):
+            self.lados_derechos[i, :len(simbolos)] = simbolos
+        self.apilar = np.array([0, 0] + [len(p) for p in producciones], dtype=np.int64)
+
+    def analizar(self, cadenas):
+        """
+        Analiza un lote de cadenas en paralelo, paso a paso.
+
+        Args:
+            cadenas (list[str]): Las cadenas a analizar.
+
+        Returns:
+            ndarray: Vector booleano con el veredicto de cada cadena.
+        """
+        resultado = np.zeros(len(cadenas), dtype=bool)
+        if not self.es_ll1 or not len(cadenas):
+            return resultado
+
+        tabla, apilar, lados_derechos = self.tabla, self.apilar, self.lados_derechos
+        maximo = lados_derechos.shape[1]
+        desplazamientos = np.arange(maximo)
+        tokens, longitudes = _codificar(cadenas, self.id_terminal,
+                                        len(self.id_terminal), self.id_terminal['$'])
+        # Una columna extra de '$' evita leer fuera de la fila tras consumir el último '$'.
+        tokens = np.hstack([tokens, tokens[:, -1:]])
+        ancho_tokens = tokens.shape[1]
+        tokens = tokens.ravel()
+
+        activos = np.arange(len(cadenas))
+        posicion = activos * ancho_tokens
+        final = posicion + longitudes + 1
+        capacidad = 64
+        pila = np.zeros(len(cadenas) * capacidad, dtype=np.int64)
+        base = activos * capacidad
+        pila[base] = self.fin
+        pila[base + 1] = self.simbolo_inicial
+        cima = base + 2
+
+        while activos.size:
+            cima -= 1
+            codigo = tabla[pila[cima] + tokens[posicion]]
+
+            # Terminal que coincide: se consume la entrada.
+            posicion += codigo == -2
+
+            # No terminal con producción: se apila su lado derecho. Se escriben las
+            # filas completas (rellenadas); lo que queda sobre la cima se ignora.
+            carriles = np.flatnonzero(codigo >= 0)
+            while carriles.size and int((cima[carriles] - base[carriles]).max()) + maximo > capacidad:
+                pila, base, cima, capacidad = _ampliar(pila, base, cima, capacidad)
+            pila[cima[carriles, None] + desplazamientos] = lados_derechos[codigo[carriles]]
+            cima += apilar[codigo + 2]
+
+            # Pila vacía: se acepta si se consumió toda la entrada, incluido '$'.
+            vacia = cima == base
+            sigue = (codigo != -1) & ~vacia
+            if not sigue.all():
+                resultado[activos[vacia]] = posicion[vacia] == final[vacia]
+                activos, posicion, final, base, cima = (
+                    activos[sigue], posicion[sigue], final[sigue], base[sigue], cima[sigue])
+
+        return resultado
+
+
+def analizar_lote(analizador, cadenas, tamaño_lote=CARRILES_POR_LOTE):
+    """
+    Analiza un lote de cadenas con la versión vectorizada del analizador dado.
+
+    Para lotes repetidos contra la misma gramática conviene crear una sola vez
+    `LoteSLR1` o `LoteLL1` y reutilizarlo. Las cadenas se analizan en tandas de
+    `tamaño_lote`, de modo que la memoria no crece con el número de cadenas.
+
+    Args:
+        analizador: Un `AnalizadorSLR1` o `AnalizadorLL1` ya construido.
+        cadenas (list[str]): Las cadenas a analizar.
+        tamaño_lote (int, opcional): Cadenas analizadas a la vez.
+
+    Returns:
+        list[bool]: El veredicto de cada cadena.
+    """
+    if hasattr(analizador, 'accion'):
+        lote = LoteSLR1(analizador)
+    else:
+        lote = LoteLL1(analizador)
+    veredictos = []
+    for inicio in range(0, len(cadenas), tamaño_lote):
+        veredictos.extend(lote.analizar(cadenas[inicio:inicio + tamaño_lote]).tolist())
+    return veredictos
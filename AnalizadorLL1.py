@@ -7,6 +7,10 @@ tabla de análisis para decidir qué producción aplicar basándose en el símbo
 actual de la entrada y el no terminal en el tope de la pila.
 """
 
+from TablaComprimida import TablaLL1Compacta
+from CacheVeredictos import CacheVeredictos
+from RecuperacionErrores import RecuperacionLL1
+
 class AnalizadorLL1:
     """
     Implementa un analizador LL(1) para una gramática dada.
@@ -20,6 +24,11 @@ class AnalizadorLL1:
         first_follow: Objeto con los conjuntos FIRST y FOLLOW.
         tabla_analisis (dict): La tabla de análisis LL(1).
         es_ll1 (bool): True si la gramatica es LL(1), False si no.
+        tabla_compacta (TablaLL1Compacta): La tabla compacta, si se generó.
+        version (int): Se incrementa cada vez que se reconstruye la tabla.
+        cache (CacheVeredictos): La caché de veredictos, si se activó.
+        recuperacion (RecuperacionLL1): Los conjuntos precalculados para
+            `analizar_con_errores`, creados en su primera llamada.
     """
     def __init__(self, gramatica, first_follow):
         """Inicializa el analizador con la gramática y los conjuntos FIRST/FOLLOW."""
@@ -27,6 +36,10 @@ class AnalizadorLL1:
         self.first_follow = first_follow
         self.tabla_analisis = {}
         self.es_ll1 = False
+        self.tabla_compacta = None
+        self.version = 0
+        self.cache = None
+        self.recuperacion = None
 
     def construir_tabla_analisis(self):
         """
@@ -45,29 +58,30 @@ class AnalizadorLL1:
             bool: True si la tabla se construyó sin conflictos, False si no.
         """
         self.tabla_analisis = {}
+        self.version += 1
         conflictos = []
 
-        for nt in self.gramatica.no_terminales:
-            for produccion in self.gramatica.obtener_producciones(nt):
-                first_prod = self.first_follow._first_de_cadena(produccion)
-
-                # Aplica la Regla 1
-                for terminal in first_prod:
-                    if terminal != 'e':
-                        clave = (nt, terminal)
-                        if clave in self.tabla_analisis:
-                            conflictos.append(clave)
-                        else:
-                            self.tabla_analisis[clave] = produccion
-                
-                # Aplica la Regla 2
-                if 'e' in first_prod:
-                    for terminal in self.first_follow.follow[nt]:
-                        clave = (nt, terminal)
-                        if clave in self.tabla_analisis:
-                            conflictos.append(clave)
-                        else:
-                            self.tabla_analisis[clave] = produccion
+        # Se recorren las producciones por su id estable en la gramática.
+        for nt, produccion in self.gramatica.producciones_por_id:
+            first_prod = self.first_follow._first_de_cadena(produccion)
+
+            # Aplica la Regla 1
+            for terminal in first_prod:
+                if terminal != 'e':
+                    clave = (nt, terminal)
+                    if clave in self.tabla_analisis:
+                        conflictos.append(clave)
+                    else:
+                        self.tabla_analisis[clave] = produccion
+            
+            # Aplica la Regla 2
+            if 'e' in first_prod:
+                for terminal in self.first_follow.follow[nt]:
+                    clave = (nt, terminal)
+                    if clave in self.tabla_analisis:
+                        conflictos.append(clave)
+                    else:
+                        self.tabla_analisis[clave] = produccion
         
         self.es_ll1 = not conflictos
         return self.es_ll1
@@ -91,10 +105,27 @@ class AnalizadorLL1:
         """
         if not self.es_ll1:
             return False
+        if self.cache is not None:
+            return self.cache.analizar(self, cadena_entrada)
+        return self._ejecutar(cadena_entrada)
+
+    def _ejecutar(self, cadena_entrada, indice_entrada=0, pila=None, instantaneas=None, intervalo=0):
+        """
+        Ejecuta el bucle de análisis, opcionalmente desde una configuración intermedia.
 
+        Args:
+            cadena_entrada (str): La cadena a analizar, sin '$'.
+            indice_entrada (int): Número de símbolos ya consumidos.
+            pila (tuple): La pila de símbolos tras consumirlos; None para la inicial.
+            instantaneas (list): Si se indica, recibe pares (posición, pila) cada
+                vez que se han consumido un múltiplo de `intervalo` símbolos.
+            intervalo (int): Separación entre instantáneas.
+
+        Returns:
+            bool: True si la cadena es aceptada, False en caso contrario.
+        """
         cadena_entrada += '$'
-        pila = ['$', self.gramatica.simbolo_inicial]
-        indice_entrada = 0
+        pila = ['$', self.gramatica.simbolo_inicial] if pila is None else list(pila)
 
         while pila:
             tope = pila[-1]
@@ -104,6 +135,10 @@ class AnalizadorLL1:
                 if tope == entrada_actual:
                     pila.pop()
                     indice_entrada += 1
+                    if (instantaneas is not None and indice_entrada % intervalo == 0
+                            and indice_entrada < len(cadena_entrada)):
+                        # El '$' final no forma parte de ningún prefijo.
+                        instantaneas.append((indice_entrada, tuple(pila)))
                 else:
                     return False  # Error: terminal no coincide.
             
@@ -125,6 +160,55 @@ class AnalizadorLL1:
         # La cadena es aceptada si la pila está vacía y se ha consumido toda la entrada.
         return indice_entrada == len(cadena_entrada)
 
+    def analizar_con_errores(self, cadena_entrada):
+        """
+        Analiza una cadena informando de todos sus errores sintácticos en una pasada.
+
+        A diferencia de `analizar`, no se detiene en el primer error: se recupera
+        y continúa (ver `RecuperacionErrores`). Los conjuntos de símbolos
+        esperados se calculan en la primera llamada y tras cada reconstrucción
+        de las tablas.
+
+        Args:
+            cadena_entrada (str): La cadena a analizar.
+
+        Returns:
+            list[ErrorSintactico]: Los errores encontrados; vacía si la cadena es aceptada.
+        """
+        if not self.es_ll1:
+            raise ValueError("La gramática no es LL(1): no se puede analizar con recuperación de errores.")
+        if self.recuperacion is None or self.recuperacion.version != self.version:
+            self.recuperacion = RecuperacionLL1(self)
+        return self.recuperacion.analizar(cadena_entrada)
+
+    def activar_cache(self, capacidad=100_000, memoria_maxima=64 * 1024 * 1024, intervalo=0):
+        """
+        Activa la caché de veredictos para `analizar`.
+
+        Args:
+            capacidad (int): Número máximo de entradas.
+            memoria_maxima (int): Memoria máxima estimada, en bytes.
+            intervalo (int): Cada cuántos símbolos se guarda la pila; 0 para no guardarla.
+
+        Returns:
+            CacheVeredictos: La caché, que puede compartirse entre hilos.
+        """
+        self.cache = CacheVeredictos(capacidad, memoria_maxima, intervalo)
+        return self.cache
+
+    def comprimir_tabla(self):
+        """
+        Genera la versión compacta de la tabla de análisis.
+
+        Debe llamarse después de `construir_tabla_analisis`. La tabla resultante
+        puede analizar cadenas por sí sola y publicarse en memoria compartida.
+
+        Returns:
+            TablaLL1Compacta: La tabla compacta.
+        """
+        self.tabla_compacta = TablaLL1Compacta(self)
+        return self.tabla_compacta
+
     def imprimir_tabla(self):
         """Imprime la tabla de análisis LL(1) en un formato legible."""
         print("\n=== Tabla de Análisis LL(1) ===")
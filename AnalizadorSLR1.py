@@ -10,7 +10,12 @@ El analizador utiliza los conjuntos FOLLOW para resolver conflictos de
 reducción, lo que lo hace más potente que un analizador LR(0) simple.
 """
 
+from collections import deque
+
 from ItemLR0 import ItemLR0, EstadoLR0
+from TablaComprimida import TablaComprimida
+from CacheVeredictos import CacheVeredictos
+from RecuperacionErrores import RecuperacionSLR1
 
 class AnalizadorSLR1:
     """
@@ -26,6 +31,12 @@ class AnalizadorSLR1:
         accion (dict): La tabla de acciones del analizador.
         ir_a (dict): La tabla de transiciones para no terminales.
         es_slr1 (bool): True si la gramática es SLR(1), False si no.
+        conflictos (list[str]): Los conflictos encontrados en la última construcción.
+        tabla_comprimida (TablaComprimida): Las tablas empaquetadas, si se generaron.
+        version (int): Se incrementa cada vez que se reconstruyen las tablas.
+        cache (CacheVeredictos): La caché de veredictos, si se activó.
+        recuperacion (RecuperacionSLR1): Los conjuntos precalculados para
+            `analizar_con_errores`, creados en su primera llamada.
         inicio_aumentado (str): El nuevo símbolo inicial para la gramática aumentada.
     """
     def __init__(self, gramatica, first_follow):
@@ -36,6 +47,12 @@ class AnalizadorSLR1:
         self.accion = {}
         self.ir_a = {}
         self.es_slr1 = False
+        self.conflictos = []
+        self.tabla_comprimida = None
+        self.version = 0
+        self.cache = None
+        self.recuperacion = None
+        self._items_iniciales = {}
         
         # Se aumenta la gramática con una nueva producción S' -> S
         # para tener un único punto de aceptación.
@@ -49,6 +66,9 @@ class AnalizadorSLR1:
         que podrían ser necesarias. Si un item tiene la forma [A -> α·Bβ], se
         añaden todos los items [B -> ·γ] a la clausura.
 
+        Cada no terminal se expande una sola vez, con los items iniciales de sus
+        producciones obtenidos del índice `ids_producciones` de la gramática.
+
         Args:
             items (set): Un conjunto de `ItemLR0`.
 
@@ -56,21 +76,29 @@ class AnalizadorSLR1:
             set: El conjunto de items cerrado.
         """
         conjunto_clausura = set(items)
-        agregado = True
-        while agregado:
-            agregado = False
-            nuevos_items = set()
-            for item in conjunto_clausura:
-                simbolo_sig = item.simbolo_siguiente()
-                if simbolo_sig and simbolo_sig in self.gramatica.no_terminales:
-                    for produccion in self.gramatica.obtener_producciones(simbolo_sig):
-                        nuevo_item = ItemLR0(simbolo_sig, produccion, 0)
-                        if nuevo_item not in conjunto_clausura and nuevo_item not in nuevos_items:
-                            nuevos_items.add(nuevo_item)
-                            agregado = True
-            conjunto_clausura.update(nuevos_items)
+        pendientes = list(items)
+        expandidos = set()
+        no_terminales = self.gramatica.no_terminales
+        while pendientes:
+            simbolo_sig = pendientes.pop().simbolo_siguiente()
+            if simbolo_sig in no_terminales and simbolo_sig not in expandidos:
+                expandidos.add(simbolo_sig)
+                for nuevo_item in self._items_iniciales_de(simbolo_sig):
+                    if nuevo_item not in conjunto_clausura:
+                        conjunto_clausura.add(nuevo_item)
+                        pendientes.append(nuevo_item)
         return conjunto_clausura
 
+    def _items_iniciales_de(self, no_terminal):
+        """Devuelve, en caché, los items [B -> ·γ] de todas las producciones de B."""
+        items = self._items_iniciales.get(no_terminal)
+        if items is None:
+            producciones_por_id = self.gramatica.producciones_por_id
+            items = self._items_iniciales[no_terminal] = [
+                ItemLR0(no_terminal, producciones_por_id[id_produccion][1], 0, id_produccion)
+                for id_produccion in self.gramatica.ids_producciones.get(no_terminal, [])]
+        return items
+
     def calcular_ir_a(self, items, simbolo):
         """
         Calcula la función de transición IR_A (goto) para un conjunto de items y un símbolo.
@@ -94,43 +122,52 @@ class AnalizadorSLR1:
         return self.clausura(conjunto_ir_a)
 
     def construir_automata(self):
-        """Construye el autómata de estados LR(0) (la colección canónica)."""
+        """
+        Construye el autómata de estados LR(0) (la colección canónica).
+
+        Los estados se identifican por su núcleo (los items que resultan de
+        avanzar el punto), que determina la clausura; así, la clausura solo se
+        calcula para los estados nuevos. Los núcleos de todas las transiciones
+        de un estado se agrupan en una sola pasada sobre sus items.
+        """
         # El estado inicial se crea a partir de la clausura de la producción aumentada.
-        item_inicial = ItemLR0(self.inicio_aumentado, [self.gramatica.simbolo_inicial], 0)
+        # El id -1 no coincide con ninguna producción de la gramática.
+        item_inicial = ItemLR0(self.inicio_aumentado, [self.gramatica.simbolo_inicial], 0, -1)
+        self._items_iniciales = {}
         items_iniciales = self.clausura({item_inicial})
         
         estado_inicial = EstadoLR0(0)
         estado_inicial.items = items_iniciales
         
         self.estados = [estado_inicial]
-        dict_estados = {frozenset(items_iniciales): 0}
+        dict_estados = {frozenset([item_inicial]): 0}
         
-        cola = [estado_inicial]
+        cola = deque([estado_inicial])
         while cola:
-            estado_actual = cola.pop(0)
+            estado_actual = cola.popleft()
             
-            simbolos = {item.simbolo_siguiente() for item in estado_actual.items if item.simbolo_siguiente()}
+            nucleos = {}
+            for item in estado_actual.items:
+                simbolo = item.simbolo_siguiente()
+                if simbolo:
+                    nucleos.setdefault(simbolo, set()).add(item.avanzar())
             
-            for simbolo in simbolos:
-                items_ir_a = self.calcular_ir_a(estado_actual.items, simbolo)
-                if not items_ir_a:
-                    continue
-                
-                ir_a_congelado = frozenset(items_ir_a)
-                if ir_a_congelado in dict_estados:
-                    id_estado_siguiente = dict_estados[ir_a_congelado]
+            for simbolo, nucleo in nucleos.items():
+                nucleo_congelado = frozenset(nucleo)
+                if nucleo_congelado in dict_estados:
+                    id_estado_siguiente = dict_estados[nucleo_congelado]
                 else:
                     id_estado_siguiente = len(self.estados)
                     nuevo_estado = EstadoLR0(id_estado_siguiente)
-                    nuevo_estado.items = items_ir_a
+                    nuevo_estado.items = self.clausura(nucleo)
                     
                     self.estados.append(nuevo_estado)
-                    dict_estados[ir_a_congelado] = id_estado_siguiente
+                    dict_estados[nucleo_congelado] = id_estado_siguiente
                     cola.append(nuevo_estado)
                 
                 estado_actual.transiciones[simbolo] = id_estado_siguiente
 
-    def construir_tabla_analisis(self):
+    def construir_tabla_analisis(self, mostrar_conflictos=True):
         """
         Construye las tablas de análisis SLR(1) (ACCION e IR_A).
 
@@ -140,10 +177,19 @@ class AnalizadorSLR1:
         3. Si [S' -> S·] está en Ii, entonces ACCION[i, $] = "aceptar".
         4. Si IR_A(Ii, A) = Ij, entonces IR_A[i, A] = j.
 
+        Los conflictos quedan en `self.conflictos`.
+
+        Args:
+            mostrar_conflictos (bool, opcional): Si es False, los conflictos no se
+                imprimen (útil al construir en segundo plano o desde varios hilos).
+
         Returns:
             bool: True si no hay conflictos, False si se encuentra alguno.
         """
         self.construir_automata()
+        self.accion = {}
+        self.ir_a = {}
+        self.version += 1
         conflictos = []
 
         for estado in self.estados:
@@ -163,13 +209,18 @@ class AnalizadorSLR1:
                 elif not simbolo_sig:
                     if item.no_terminal == self.inicio_aumentado:
                         # Regla 3: Aceptación
-                        self.accion[(estado.id_estado, '$')] = 'aceptar'
+                        clave = (estado.id_estado, '$')
+                        if clave in self.accion:
+                            conflictos.append(f"Conflicto Aceptar-Reducir en estado {estado.id_estado} con símbolo $")
+                        else:
+                            self.accion[clave] = 'aceptar'
                     else:
                         # Regla 2: Reducción
                         for terminal in self.first_follow.follow[item.no_terminal]:
                             clave = (estado.id_estado, terminal)
-                            produccion_a_reducir = (item.no_terminal, tuple(item.produccion))
-                            if clave in self.accion:
+                            if self.accion.get(clave) == 'aceptar':
+                                conflictos.append(f"Conflicto Aceptar-Reducir en estado {estado.id_estado} con símbolo {terminal}")
+                            elif clave in self.accion:
                                 conflictos.append(f"Conflicto Reducir-Reducir en estado {estado.id_estado} con símbolo {terminal}")
                             else:
                                 self.accion[clave] = ('reducir', item.no_terminal, item.produccion)
@@ -179,8 +230,9 @@ class AnalizadorSLR1:
                 if simbolo in self.gramatica.no_terminales:
                     self.ir_a[(estado.id_estado, simbolo)] = id_estado_siguiente
 
+        self.conflictos = conflictos
         self.es_slr1 = not conflictos
-        if conflictos:
+        if conflictos and mostrar_conflictos:
             print("Conflictos encontrados:", conflictos)
         return self.es_slr1
 
@@ -199,10 +251,27 @@ class AnalizadorSLR1:
         """
         if not self.es_slr1:
             return False
-        
+        if self.cache is not None:
+            return self.cache.analizar(self, cadena_entrada)
+        return self._ejecutar(cadena_entrada)
+
+    def _ejecutar(self, cadena_entrada, indice_entrada=0, pila=None, instantaneas=None, intervalo=0):
+        """
+        Ejecuta el bucle de análisis, opcionalmente desde una configuración intermedia.
+
+        Args:
+            cadena_entrada (str): La cadena a analizar, sin '$'.
+            indice_entrada (int): Número de símbolos ya consumidos.
+            pila (tuple): La pila de estados tras consumirlos; None para la inicial.
+            instantaneas (list): Si se indica, recibe pares (posición, pila) cada
+                vez que se han consumido un múltiplo de `intervalo` símbolos.
+            intervalo (int): Separación entre instantáneas.
+
+        Returns:
+            bool: True si la cadena es aceptada, False si no.
+        """
         cadena_entrada += '$'
-        pila = [0]
-        indice_entrada = 0
+        pila = [0] if pila is None else list(pila)
         
         while True:
             estado = pila[-1]
@@ -220,6 +289,8 @@ class AnalizadorSLR1:
             elif accion[0] == 'desplazar':
                 pila.append(accion[1])
                 indice_entrada += 1
+                if instantaneas is not None and indice_entrada % intervalo == 0:
+                    instantaneas.append((indice_entrada, tuple(pila)))
             
             elif accion[0] == 'reducir':
                 no_terminal, produccion = accion[1], accion[2]
@@ -239,6 +310,55 @@ class AnalizadorSLR1:
             else:
                 return False # Acción desconocida.
 
+    def analizar_con_errores(self, cadena_entrada):
+        """
+        Analiza una cadena informando de todos sus errores sintácticos en una pasada.
+
+        A diferencia de `analizar`, no se detiene en el primer error: se recupera
+        y continúa (ver `RecuperacionErrores`). Los conjuntos de símbolos
+        esperados se calculan en la primera llamada y tras cada reconstrucción
+        de las tablas.
+
+        Args:
+            cadena_entrada (str): La cadena a analizar.
+
+        Returns:
+            list[ErrorSintactico]: Los errores encontrados; vacía si la cadena es aceptada.
+        """
+        if not self.es_slr1:
+            raise ValueError("La gramática no es SLR(1): no se puede analizar con recuperación de errores.")
+        if self.recuperacion is None or self.recuperacion.version != self.version:
+            self.recuperacion = RecuperacionSLR1(self)
+        return self.recuperacion.analizar(cadena_entrada)
+
+    def activar_cache(self, capacidad=100_000, memoria_maxima=64 * 1024 * 1024, intervalo=0):
+        """
+        Activa la caché de veredictos para `analizar`.
+
+        Args:
+            capacidad (int): Número máximo de entradas.
+            memoria_maxima (int): Memoria máxima estimada, en bytes.
+            intervalo (int): Cada cuántos símbolos se guarda la pila; 0 para no guardarla.
+
+        Returns:
+            CacheVeredictos: La caché, que puede compartirse entre hilos.
+        """
+        self.cache = CacheVeredictos(capacidad, memoria_maxima, intervalo)
+        return self.cache
+
+    def comprimir_tabla(self):
+        """
+        Genera la versión empaquetada de las tablas ACCION e IR_A.
+
+        Debe llamarse después de `construir_tabla_analisis`. La tabla resultante
+        puede analizar cadenas por sí sola mediante `TablaComprimida.analizar`.
+
+        Returns:
+            TablaComprimida: Las tablas comprimidas.
+        """
+        self.tabla_comprimida = TablaComprimida(self)
+        return self.tabla_comprimida
+
     def imprimir_estados(self):
         """Imprime los estados y transiciones del autómata LR(0) para depuración."""
         print("\n=== Autómata LR(0) ===")
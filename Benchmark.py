@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Mediciones de Rendimiento
+
+Este script reúne las mediciones usadas para comparar las distintas
+implementaciones del proyecto sobre gramáticas y cadenas generadas.
+
+Uso:
+    python Benchmark.py lotes gramatica.txt [--cantidad 20000] [--min 20] [--max 200]
+    python Benchmark.py first_follow [--no-terminales 2000] [--terminales 300]
+    python Benchmark.py prefijos gramatica.txt [--bases 500] [--variantes 20]
+    python Benchmark.py paralelo gramatica.txt entrada.txt [--procesos N] [--trozo 1048576]
+    python Benchmark.py errores gramatica.txt [--cantidad 2000] [--errores 3] [--exhaustiva 3]
+"""
+
+import argparse
+import itertools
+import random
+import time
+
+from Gramatica import Gramatica
+from First_Follow import First_Follow
+from AnalizadorLL1 import AnalizadorLL1
+from AnalizadorSLR1 import AnalizadorSLR1
+
+
+def cargar_gramatica(ruta):
+    """Lee una gramática desde un archivo."""
+    gramatica = Gramatica()
+    gramatica.cargar_archivo(ruta)
+    return gramatica
+
+
+def construir_analizadores(gramatica):
+    """Calcula FIRST/FOLLOW y construye ambos analizadores, sin imprimir conflictos."""
+    first_follow = First_Follow(gramatica)
+    first_follow.calcular_first()
+    first_follow.calcular_follow()
+    analizador_ll1 = AnalizadorLL1(gramatica, first_follow)
+    analizador_ll1.construir_tabla_analisis()
+    analizador_slr1 = AnalizadorSLR1(gramatica, first_follow)
+    analizador_slr1.construir_tabla_analisis(mostrar_conflictos=False)
+    return analizador_ll1, analizador_slr1
+
+
+def generar_gramatica(numero_no_terminales, numero_terminales, producciones_por_no_terminal=3,
+                      longitud_maxima=4, tasa_epsilon=0.1, semilla=0):
+    """
+    Genera una gramática aleatoria grande, con símbolos de varios caracteres.
+
+    Los no terminales se llaman 'N0', 'N1'... y los terminales 't0', 't1'...,
+    por lo que la gramática se construye con `agregar_produccion` en lugar de
+    parsearse desde texto.
+
+    Returns:
+        Gramatica: La gramática generada, con 'N0' como símbolo inicial.
+    """
+    azar = random.Random(semilla)
+    no_terminales = [f"N{i}" for i in range(numero_no_terminales)]
+    terminales = [f"t{i}" for i in range(numero_terminales)]
+    gramatica = Gramatica()
+    for nt in no_terminales:
+        for _ in range(producciones_por_no_terminal):
+            if azar.random() < tasa_epsilon:
+                gramatica.agregar_produccion(nt, ['e'])
+                continue
+            produccion = [azar.choice(no_terminales) if azar.random() < 0.5 else azar.choice(terminales)
+                          for _ in range(azar.randint(1, longitud_maxima))]
+            gramatica.agregar_produccion(nt, produccion)
+    gramatica.simbolo_inicial = no_terminales[0]
+    gramatica.terminales.add('$')
+    return gramatica
+
+
+def _longitudes_minimas(gramatica):
+    """Calcula la longitud de la cadena terminal más corta derivable de cada no terminal."""
+    minimo = {nt: float('inf') for nt in gramatica.no_terminales}
+
+    def longitud(produccion):
+        if produccion == ['e']:
+            return 0
+        return sum(minimo.get(s, 0) if s in gramatica.no_terminales else 1 for s in produccion)
+
+    cambio = True
+    while cambio:
+        cambio = False
+        for nt in gramatica.no_terminales:
+            for produccion in gramatica.obtener_producciones(nt):
+                if longitud(produccion) < minimo[nt]:
+                    minimo[nt] = longitud(produccion)
+                    cambio = True
+    return minimo, longitud
+
+
+def generar_cadenas(gramatica, cantidad, longitud_min=1, longitud_max=50,
+                    tasa_errores=0.3, semilla=0):
+    """
+    Genera cadenas mediante derivaciones aleatorias de la gramática.
+
+    Las producciones se eligen al azar mientras la longitud lo permita; al
+    acercarse al máximo se eligen las que terminan antes. Una fracción de las
+    cadenas se altera (se elimina un carácter) para incluir rechazos.
+
+    Returns:
+        list[str]: Las cadenas generadas.
+    """
+    azar = random.Random(semilla)
+    minimo, longitud = _longitudes_minimas(gramatica)
+    cadenas = []
+    intentos = 0
+    while len(cadenas) < cantidad and intentos < cantidad * 100:
+        intentos += 1
+        objetivo = azar.randint(longitud_min, longitud_max)
+        salida = []
+        pendientes = [gramatica.simbolo_inicial]
+        while pendientes:
+            simbolo = pendientes.pop()
+            if simbolo not in gramatica.no_terminales:
+                if simbolo != 'e':
+                    salida.append(simbolo)
+                continue
+            producciones = gramatica.obtener_producciones(simbolo)
+            restante = sum(minimo.get(s, 1) for s in pendientes if s in gramatica.no_terminales)
+            if len(salida) + restante >= objetivo:
+                producciones = [min(producciones, key=longitud)]
+            pendientes.extend(reversed(azar.choice(producciones)))
+
+        cadena = ''.join(salida)
+        if longitud_min <= len(cadena) <= longitud_max:
+            if cadena and azar.random() < tasa_errores:
+                i = azar.randrange(len(cadena))
+                cadena = cadena[:i] + cadena[i + 1:]
+            cadenas.append(cadena)
+    return cadenas
+
+
+def _cronometrar(funcion, *argumentos):
+    """Ejecuta una función y devuelve su resultado y el tiempo empleado."""
+    inicio = time.perf_counter()
+    resultado = funcion(*argumentos)
+    return resultado, time.perf_counter() - inicio
+
+
+def medir_lotes(argumentos):
+    """Compara el análisis cadena por cadena con el análisis vectorizado por lotes."""
+    from AnalisisVectorizado import LoteLL1, LoteSLR1
+
+    gramatica = cargar_gramatica(argumentos.gramatica)
+    analizador_ll1, analizador_slr1 = construir_analizadores(gramatica)
+    cadenas = generar_cadenas(gramatica, argumentos.cantidad, argumentos.min, argumentos.max)
+    print(f"{len(cadenas)} cadenas, longitud media {sum(map(len, cadenas)) / len(cadenas):.1f}")
+
+    for nombre, analizador, lote, compatible in (
+            ('LL(1)', analizador_ll1, LoteLL1, analizador_ll1.es_ll1),
+            ('SLR(1)', analizador_slr1, LoteSLR1, analizador_slr1.es_slr1)):
+        if not compatible:
+            print(f"{nombre}: la gramática no es compatible.")
+            continue
+        esperados, t_secuencial = _cronometrar(lambda: [analizador.analizar(c) for c in cadenas])
+        vectorizado = lote(analizador)
+        obtenidos, t_lote = _cronometrar(vectorizado.analizar, cadenas)
+        coinciden = obtenidos.tolist() == esperados
+        print(f"{nombre}: secuencial {t_secuencial:.3f} s, lotes {t_lote:.3f} s, "
+              f"aceleración {t_secuencial / t_lote:.1f}x, aceptadas {sum(esperados)}, "
+              f"veredictos {'idénticos' if coinciden else 'DISTINTOS'}")
+
+
+def medir_first_follow(argumentos):
+    """Compara los backends iterativo y matricial de First/Follow en una gramática generada."""
+    gramatica = generar_gramatica(argumentos.no_terminales, argumentos.terminales,
+                                  argumentos.producciones, semilla=argumentos.semilla)
+    print(f"{len(gramatica.no_terminales)} no terminales, {len(gramatica.terminales)} terminales")
+
+    resultados = {}
+    for backend in First_Follow.BACKENDS:
+        first_follow = First_Follow(gramatica, backend)
+        _, t_first = _cronometrar(first_follow.calcular_first)
+        _, t_follow = _cronometrar(first_follow.calcular_follow)
+        resultados[backend] = (first_follow.first, first_follow.follow)
+        print(f"{backend}: FIRST {t_first:.3f} s, FOLLOW {t_follow:.3f} s")
+
+    coinciden = resultados['iterativo'] == resultados['matricial']
+    print(f"Conjuntos {'idénticos' if coinciden else 'DISTINTOS'}")
+
+
+def medir_prefijos(argumentos):
+    """Compara el análisis cadena por cadena con el análisis por prefijos compartidos."""
+    from AnalisisPrefijos import PrefijosLL1, PrefijosSLR1
+
+    gramatica = cargar_gramatica(argumentos.gramatica)
+    analizador_ll1, analizador_slr1 = construir_analizadores(gramatica)
+
+    # Cada cadena base genera variantes que solo difieren en su final.
+    azar = random.Random(0)
+    alfabeto = sorted(gramatica.terminales - {'$'})
+    cadenas = []
+    for base in generar_cadenas(gramatica, argumentos.bases, argumentos.min, argumentos.max, tasa_errores=0):
+        for _ in range(argumentos.variantes):
+            corte = len(base) - azar.randint(0, min(argumentos.sufijo, len(base)))
+            cadenas.append(base[:corte] + ''.join(azar.choice(alfabeto)
+                                                  for _ in range(azar.randint(0, argumentos.sufijo))))
+    print(f"{len(cadenas)} cadenas, longitud media {sum(map(len, cadenas)) / len(cadenas):.1f}")
+
+    for nombre, analizador, recorrido, compatible in (
+            ('LL(1)', analizador_ll1, PrefijosLL1, analizador_ll1.es_ll1),
+            ('SLR(1)', analizador_slr1, PrefijosSLR1, analizador_slr1.es_slr1)):
+        if not compatible:
+            print(f"{nombre}: la gramática no es compatible.")
+            continue
+        esperados, t_secuencial = _cronometrar(lambda: [analizador.analizar(c) for c in cadenas])
+        prefijos = recorrido(analizador)
+        obtenidos, t_prefijos = _cronometrar(prefijos.analizar, cadenas)
+        print(f"{nombre}: secuencial {t_secuencial:.3f} s, prefijos {t_prefijos:.3f} s, "
+              f"aceleración {t_secuencial / t_prefijos:.1f}x, "
+              f"pasos {prefijos.pasos} de {prefijos.longitud_total}, "
+              f"veredictos {'idénticos' if obtenidos == esperados else 'DISTINTOS'}")
+
+
+def medir_paralelo(argumentos):
+    """Compara el análisis SLR(1) secuencial de una cadena larga con el análisis paralelo por trozos."""
+    from AnalisisParalelo import AnalizadorParalelo
+
+    gramatica = cargar_gramatica(argumentos.gramatica)
+    _, analizador_slr1 = construir_analizadores(gramatica)
+    if not analizador_slr1.es_slr1:
+        print("SLR(1): la gramática no es compatible.")
+        return
+    with open(argumentos.entrada, encoding='utf-8') as archivo:
+        cadena = archivo.read().strip()
+    print(f"Entrada de {len(cadena)} símbolos")
+
+    esperado, t_secuencial = _cronometrar(analizador_slr1.analizar, cadena)
+    with AnalizadorParalelo(analizador_slr1, argumentos.procesos, argumentos.trozo,
+                            argumentos.max_alternativas) as paralelo:
+        paralelo._iniciar()  # El arranque de los procesos no forma parte de la medición.
+        obtenido, t_paralelo = _cronometrar(paralelo.analizar, cadena)
+        informe = paralelo.informe
+    print(f"SLR(1): secuencial {t_secuencial:.3f} s, paralelo {t_paralelo:.3f} s, "
+          f"aceleración {t_secuencial / t_paralelo:.2f}x, veredicto "
+          f"{'idéntico' if obtenido == esperado else 'DISTINTO'} ({'si' if esperado else 'no'})")
+    print(f"Trozos: {informe['trozos']} ({informe['trozos_secuenciales']} analizados "
+          f"secuencialmente por exceso de especulación), modo {informe['modo']}, "
+          f"especulación {informe['especulacion']:.1f}x el análisis directo, "
+          f"aceleración estimada por muestreo {informe['aceleracion_estimada']:.2f}x")
+
+
+def medir_errores(argumentos):
+    """
+    Compara el análisis que se detiene en el primer error con la recuperación en una pasada.
+
+    Además de las cadenas generadas y alteradas, se analizan todas las cadenas
+    de hasta `--exhaustiva` símbolos: las pilas a las que llega la recuperación
+    tras errores al principio de la cadena son las más alejadas de una válida
+    (ej: con 'A -> A' y 'A -> e', reanudar en un estado con [A -> A·] repetía
+    la reducción unitaria sin fin).
+    """
+    gramatica = cargar_gramatica(argumentos.gramatica)
+    analizador_ll1, analizador_slr1 = construir_analizadores(gramatica)
+
+    # Cada cadena recibe varias alteraciones: sustituciones, eliminaciones o inserciones.
+    azar = random.Random(0)
+    alfabeto = sorted(gramatica.terminales - {'$'})
+    cadenas = []
+    for cadena in generar_cadenas(gramatica, argumentos.cantidad, argumentos.min, argumentos.max, tasa_errores=0):
+        simbolos = list(cadena)
+        for _ in range(argumentos.errores):
+            posicion = azar.randrange(len(simbolos) + 1)
+            operacion = azar.randrange(3)
+            if operacion == 0 and posicion < len(simbolos):
+                simbolos[posicion] = azar.choice(alfabeto)
+            elif operacion == 1 and posicion < len(simbolos):
+                del simbolos[posicion]
+            else:
+                simbolos.insert(posicion, azar.choice(alfabeto))
+        cadenas.append(''.join(simbolos))
+    for longitud in range(argumentos.exhaustiva + 1):
+        cadenas.extend(map(''.join, itertools.product(alfabeto, repeat=longitud)))
+    print(f"{len(cadenas)} cadenas, longitud media {sum(map(len, cadenas)) / len(cadenas):.1f}, "
+          f"{argumentos.errores} alteraciones por cadena")
+
+    for nombre, analizador, compatible in (('LL(1)', analizador_ll1, analizador_ll1.es_ll1),
+                                           ('SLR(1)', analizador_slr1, analizador_slr1.es_slr1)):
+        if not compatible:
+            print(f"{nombre}: la gramática no es compatible.")
+            continue
+        analizador.analizar_con_errores('')  # Los conjuntos se precalculan fuera de la medición.
+        veredictos, t_veredictos = _cronometrar(lambda: [analizador.analizar(c) for c in cadenas])
+        errores, t_errores = _cronometrar(lambda: [analizador.analizar_con_errores(c) for c in cadenas])
+        coinciden = all(veredicto == (not lista) for veredicto, lista in zip(veredictos, errores))
+        print(f"{nombre}: primer error {t_veredictos:.3f} s, todos los errores {t_errores:.3f} s, "
+              f"{sum(map(len, errores))} errores en {veredictos.count(False)} cadenas rechazadas, "
+              f"veredictos {'idénticos' if coinciden else 'DISTINTOS'}")
+
+
+def main():
+    """Punto de entrada de línea de comandos."""
+    parser = argparse.ArgumentParser(description="Mediciones de rendimiento del proyecto.")
+    subcomandos = parser.add_subparsers(dest='medicion', required=True)
+
+    lotes = subcomandos.add_parser('lotes', help="análisis por lotes vectorizado frente a secuencial")
+    lotes.add_argument('gramatica')
+    lotes.add_argument('--cantidad', type=int, default=20000)
+    lotes.add_argument('--min', type=int, default=20)
+    lotes.add_argument('--max', type=int, default=200)
+    lotes.set_defaults(funcion=medir_lotes)
+
+    first_follow = subcomandos.add_parser('first_follow', help="backends de First/Follow")
+    first_follow.add_argument('--no-terminales', type=int, default=2000)
+    first_follow.add_argument('--terminales', type=int, default=300)
+    first_follow.add_argument('--producciones', type=int, default=3)
+    first_follow.add_argument('--semilla', type=int, default=0)
+    first_follow.set_defaults(funcion=medir_first_follow)
+
+    prefijos = subcomandos.add_parser('prefijos', help="análisis por prefijos compartidos frente a secuencial")
+    prefijos.add_argument('gramatica')
+    prefijos.add_argument('--bases', type=int, default=500)
+    prefijos.add_argument('--variantes', type=int, default=20)
+    prefijos.add_argument('--sufijo', type=int, default=5)
+    prefijos.add_argument('--min', type=int, default=50)
+    prefijos.add_argument('--max', type=int, default=300)
+    prefijos.set_defaults(funcion=medir_prefijos)
+
+    paralelo = subcomandos.add_parser('paralelo', help="análisis paralelo por trozos de una cadena larga")
+    paralelo.add_argument('gramatica')
+    paralelo.add_argument('entrada')
+    paralelo.add_argument('--procesos', type=int, default=None)
+    paralelo.add_argument('--trozo', type=int, default=1 << 20)
+    paralelo.add_argument('--max-alternativas', type=int, default=256)
+    paralelo.set_defaults(funcion=medir_paralelo)
+
+    errores = subcomandos.add_parser('errores', help="recuperación de errores frente a detenerse en el primero")
+    errores.add_argument('gramatica')
+    errores.add_argument('--cantidad', type=int, default=2000)
+    errores.add_argument('--errores', type=int, default=3)
+    errores.add_argument('--min', type=int, default=100)
+    errores.add_argument('--max', type=int, default=1000)
+    errores.add_argument('--exhaustiva', type=int, default=3)
+    errores.set_defaults(funcion=medir_errores)
+
+    argumentos = parser.parse_args()
+    argumentos.funcion(argumentos)
+
+
+if __name__ == "__main__":
+    main()
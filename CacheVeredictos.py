@@ -0,0 +1,195 @@
+"""
+Caché de Veredictos para Entradas Repetidas
+
+Este módulo memoriza los veredictos de un analizador (`AnalizadorLL1` o
+`AnalizadorSLR1`) para no volver a analizar cadenas ya vistas. Se activa con
+`activar_cache` en el propio analizador, y `analizar` la consulta de forma
+transparente.
+
+Características:
+- LRU acotada por número de entradas y por memoria estimada.
+- Las entradas se identifican por una huella BLAKE2b de 128 bits de la cadena,
+  de modo que el tamaño de cada entrada no depende de la longitud de la cadena.
+- Invalidación automática: el analizador incrementa su `version` cada vez que
+  reconstruye sus tablas, y la caché se vacía al detectar el cambio.
+- Instantáneas opcionales: cada `intervalo` símbolos se guarda la pila del
+  analizador tras consumir ese prefijo. Una cadena que extiende un prefijo
+  guardado reanuda el análisis desde ahí en lugar de empezar de cero.
+- Segura entre hilos: las estructuras se protegen con un candado y el análisis
+  se hace fuera de él.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Estimaciones en bytes para la contabilidad de memoria: una entrada (clave,
+# huella y nodo de la LRU) y cada elemento de la pila de una instantánea.
+_BYTES_ENTRADA = 160
+_BYTES_ELEMENTO_PILA = 8
+
+_VEREDICTO = 0
+_INSTANTANEA = 1
+
+
+class CacheVeredictos:
+    """
+    Caché LRU, segura entre hilos, de veredictos y configuraciones de un analizador.
+
+    Atributos:
+        capacidad (int): Número máximo de entradas (veredictos más instantáneas).
+        memoria_maxima (int): Memoria máxima estimada, en bytes.
+        intervalo (int): Cada cuántos símbolos se guarda una instantánea de la
+            pila; 0 para no guardar instantáneas.
+        aciertos (int): Veredictos servidos desde la caché.
+        fallos (int): Cadenas que hubo que analizar.
+        reanudaciones (int): Fallos que reanudaron desde una instantánea.
+        desalojos (int): Entradas expulsadas para respetar los límites.
+        invalidaciones (int): Veces que la caché se vació por una reconstrucción de tablas.
+    """
+    def __init__(self, capacidad=100_000, memoria_maxima=64 * 1024 * 1024, intervalo=0):
+        """Inicializa una caché vacía con los límites indicados."""
+        self.capacidad = capacidad
+        self.memoria_maxima = memoria_maxima
+        self.intervalo = intervalo
+        self.aciertos = 0
+        self.fallos = 0
+        self.reanudaciones = 0
+        self.desalojos = 0
+        self.invalidaciones = 0
+        self._entradas = OrderedDict()
+        self._memoria = 0
+        self._version = None
+        self._candado = threading.Lock()
+
+    def analizar(self, analizador, cadena_entrada):
+        """
+        Devuelve el veredicto de una cadena, analizándola solo si no está en caché.
+
+        Args:
+            analizador: El `AnalizadorLL1` o `AnalizadorSLR1` dueño de la caché.
+            cadena_entrada (str): La cadena a analizar.
+
+        Returns:
+            bool: True si la cadena es aceptada, False si no.
+        """
+        huellas, clave = self._huellas(cadena_entrada)
+        with self._candado:
+            if analizador.version != self._version:
+                self._vaciar(analizador.version)
+
+            veredicto = self._entradas.get((_VEREDICTO, clave))
+            if veredicto is not None:
+                self._entradas.move_to_end((_VEREDICTO, clave))
+                self.aciertos += 1
+                return veredicto
+            self.fallos += 1
+
+            # Se busca la instantánea del prefijo más largo disponible.
+            indice, pila = 0, None
+            for posicion, huella in reversed(huellas):
+                pila = self._entradas.get((_INSTANTANEA, huella))
+                if pila is not None:
+                    self._entradas.move_to_end((_INSTANTANEA, huella))
+                    self.reanudaciones += 1
+                    indice = posicion
+                    break
+            version = self._version
+
+        instantaneas = [] if self.intervalo else None
+        veredicto = analizador._ejecutar(cadena_entrada, indice, pila, instantaneas, self.intervalo)
+
+        with self._candado:
+            if version != self._version:
+                return veredicto  # Las tablas cambiaron durante el análisis.
+            self._guardar((_VEREDICTO, clave), veredicto, _BYTES_ENTRADA)
+            if instantaneas:
+                por_posicion = dict(huellas)
+                for posicion, pila in instantaneas:
+                    self._guardar((_INSTANTANEA, por_posicion[posicion]), pila,
+                                  _BYTES_ENTRADA + _BYTES_ELEMENTO_PILA * len(pila))
+        return veredicto
+
+    def _huellas(self, cadena_entrada):
+        """
+        Calcula, en una sola pasada, la huella de la cadena y las de sus prefijos.
+
+        Returns:
+            tuple: La lista de pares (posición, huella) de los prefijos cuya
+            longitud es múltiplo de `intervalo`, y la huella de la cadena completa.
+        """
+        resumen = hashlib.blake2b(digest_size=16)
+        huellas = []
+        if self.intervalo:
+            anterior = 0
+            for posicion in range(self.intervalo, len(cadena_entrada) + 1, self.intervalo):
+                resumen.update(cadena_entrada[anterior:posicion].encode('utf-8'))
+                huellas.append((posicion, resumen.copy().digest()))
+                anterior = posicion
+            resumen.update(cadena_entrada[anterior:].encode('utf-8'))
+        else:
+            resumen.update(cadena_entrada.encode('utf-8'))
+        return huellas, resumen.digest()
+
+    def _guardar(self, clave, valor, tamaño):
+        """Inserta o refresca una entrada y desaloja las menos recientes si hace falta."""
+        anterior = self._entradas.pop(clave, None)
+        if anterior is not None:
+            self._memoria -= self._tamaño(clave, anterior)
+        self._entradas[clave] = valor
+        self._memoria += tamaño
+        while self._entradas and (len(self._entradas) > self.capacidad
+                                  or self._memoria > self.memoria_maxima):
+            clave_expulsada, expulsada = self._entradas.popitem(last=False)
+            self._memoria -= self._tamaño(clave_expulsada, expulsada)
+            self.desalojos += 1
+
+    @staticmethod
+    def _tamaño(clave, valor):
+        """Devuelve la memoria estimada de una entrada."""
+        if clave[0] == _VEREDICTO:
+            return _BYTES_ENTRADA
+        return _BYTES_ENTRADA + _BYTES_ELEMENTO_PILA * len(valor)
+
+    def _vaciar(self, version):
+        """Elimina todas las entradas y las asocia a una nueva versión de las tablas."""
+        if self._version is not None:
+            self.invalidaciones += 1
+        self._entradas.clear()
+        self._memoria = 0
+        self._version = version
+
+    def invalidar(self):
+        """Vacía la caché manualmente."""
+        with self._candado:
+            self._entradas.clear()
+            self._memoria = 0
+            self._version = None
+            self.invalidaciones += 1
+
+    def __len__(self):
+        """Devuelve el número de entradas (veredictos más instantáneas)."""
+        return len(self._entradas)
+
+    def estadisticas(self):
+        """
+        Devuelve las estadísticas de uso de la caché.
+
+        Returns:
+            dict: Aciertos, fallos, reanudaciones, desalojos, invalidaciones, tasa
+            de aciertos, número de entradas y memoria estimada ocupada.
+        """
+        with self._candado:
+            consultas = self.aciertos + self.fallos
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'reanudaciones': self.reanudaciones,
+                'desalojos': self.desalojos,
+                'invalidaciones': self.invalidaciones,
+                'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+                'entradas': len(self._entradas),
+                'memoria': self._memoria,
+                'memoria_maxima': self.memoria_maxima,
+                'capacidad': self.capacidad,
+            }
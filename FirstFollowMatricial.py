@@ -0,0 +1,205 @@
+"""
+Cálculo Matricial de los Conjuntos First y Follow
+
+Este módulo es el backend 'matricial' de `First_Follow`. En lugar de iterar
+uniones de conjuntos hasta que nada cambie, expresa las relaciones entre
+símbolos como matrices booleanas de NumPy:
+
+- "Comienza con" (A, X): A -> αXβ con α anulable.
+- "Seguido de" (B, X): A -> αBγXβ con γ anulable.
+- "Termina en" (B, A): A -> αBβ con β anulable, es decir, Follow(A) ⊆ Follow(B).
+
+La clausura reflexiva y transitiva se obtiene con el algoritmo de Warshall
+sobre filas empaquetadas en bits, y los conjuntos resultan de un único
+producto contra la matriz de incidencia de terminales. Los resultados son
+idénticos a los del backend iterativo, incluido el tratamiento de los símbolos
+que no son ni terminales ni no terminales (se consideran transparentes, como
+en `_first_de_cadena`).
+
+NumPy es una dependencia opcional: solo se necesita para este backend.
+"""
+
+from AnalisisVectorizado import np, requerir_numpy
+
+_FUNCIONALIDAD = "El backend matricial de First/Follow"
+
+
+def _indices(gramatica):
+    """Asigna índices de fila a los no terminales y de columna a los terminales."""
+    no_terminales = sorted(gramatica.no_terminales)
+    terminales = sorted(gramatica.terminales)
+    return (no_terminales, {nt: i for i, nt in enumerate(no_terminales)},
+            terminales, {t: j for j, t in enumerate(terminales)})
+
+
+def _anulables(gramatica):
+    """
+    Calcula los no terminales que derivan en epsilon.
+
+    Usa un contador de símbolos pendientes por producción, de modo que cada
+    ocurrencia se procesa una sola vez.
+
+    Returns:
+        set: Los no terminales anulables.
+    """
+    anulables = set()
+    pendientes = []
+    ocurrencias = {nt: [] for nt in gramatica.no_terminales}
+    cola = []
+
+    for nt in gramatica.no_terminales:
+        for produccion in gramatica.obtener_producciones(nt):
+            if any(s in gramatica.terminales for s in produccion):
+                continue  # Un terminal impide que la producción sea anulable.
+            faltan = [s for s in produccion if s in gramatica.no_terminales]
+            indice = len(pendientes)
+            pendientes.append([nt, len(faltan)])
+            for s in faltan:
+                ocurrencias[s].append(indice)
+            if not faltan:
+                cola.append(nt)
+
+    while cola:
+        nt = cola.pop()
+        if nt in anulables:
+            continue
+        anulables.add(nt)
+        for indice in ocurrencias[nt]:
+            pendientes[indice][1] -= 1
+            if pendientes[indice][1] == 0:
+                cola.append(pendientes[indice][0])
+    return anulables
+
+
+def _recorrer_prefijo(simbolos, gramatica, anulables):
+    """
+    Genera los símbolos visibles al comienzo de una secuencia.
+
+    Recorre la secuencia mientras los símbolos previos sean anulables (o
+    transparentes) y se detiene tras el primer terminal o no terminal no anulable.
+    """
+    for simbolo in simbolos:
+        if simbolo in gramatica.terminales:
+            yield simbolo
+            return
+        if simbolo in gramatica.no_terminales:
+            yield simbolo
+            if simbolo not in anulables:
+                return
+
+
+def _clausura(relacion):
+    """
+    Calcula la clausura reflexiva y transitiva de una relación booleana.
+
+    Aplica el algoritmo de Warshall sobre filas empaquetadas en bits: en el
+    paso k, cada fila que alcanza k incorpora, con un OR vectorizado, todo lo
+    que alcanza k. Es mucho más rápido que elevar al cuadrado con productos
+    densos cuando la relación tiene miles de filas.
+
+    Args:
+        relacion (ndarray): Matriz booleana n x n.
+
+    Returns:
+        ndarray: La clausura, como matriz booleana.
+    """
+    n = len(relacion)
+    bits = np.packbits(relacion | np.eye(n, dtype=bool), axis=1)
+    for k in range(n):
+        filas = np.flatnonzero(bits[:, k >> 3] & (0x80 >> (k & 7)))
+        if filas.size > 1:
+            bits[filas] |= bits[k]
+    return np.unpackbits(bits, axis=1, count=n).astype(bool)
+
+
+def _a_conjuntos(matriz, no_terminales, terminales):
+    """Convierte una matriz booleana no_terminales x terminales en un diccionario de conjuntos."""
+    simbolos = np.array(terminales, dtype=object)
+    return {nt: set(simbolos[fila].tolist()) for nt, fila in zip(no_terminales, matriz)}
+
+
+def calcular_first(gramatica):
+    """
+    Calcula los conjuntos First de todos los no terminales.
+
+    Args:
+        gramatica: La `Gramatica` a analizar.
+
+    Returns:
+        dict: Mapeo de no terminal a su conjunto First (con 'e' si es anulable).
+    """
+    requerir_numpy(_FUNCIONALIDAD)
+    no_terminales, fila, terminales, columna = _indices(gramatica)
+    anulables = _anulables(gramatica)
+
+    comienza_con = np.zeros((len(no_terminales), len(no_terminales)), dtype=bool)
+    incidencia = np.zeros((len(no_terminales), len(terminales)), dtype=bool)
+    for nt in no_terminales:
+        for produccion in gramatica.obtener_producciones(nt):
+            for simbolo in _recorrer_prefijo(produccion, gramatica, anulables):
+                if simbolo in columna:
+                    incidencia[fila[nt], columna[simbolo]] = True
+                else:
+                    comienza_con[fila[nt], fila[simbolo]] = True
+
+    first = _a_conjuntos((_clausura(comienza_con).astype(np.float32)
+                          @ incidencia.astype(np.float32)) > 0, no_terminales, terminales)
+    for nt in anulables:
+        first[nt].add('e')
+    return first
+
+
+def calcular_follow(gramatica, first):
+    """
+    Calcula los conjuntos Follow de todos los no terminales.
+
+    Args:
+        gramatica: La `Gramatica` a analizar.
+        first (dict): Los conjuntos First ya calculados.
+
+    Returns:
+        dict: Mapeo de no terminal a su conjunto Follow.
+    """
+    requerir_numpy(_FUNCIONALIDAD)
+    no_terminales, fila, terminales, columna = _indices(gramatica)
+    anulables = {nt for nt in no_terminales if 'e' in first[nt]}
+
+    seguido_de = np.zeros((len(no_terminales), len(no_terminales)), dtype=bool)
+    directos = np.zeros((len(no_terminales), len(terminales)), dtype=bool)
+    termina_en = np.zeros((len(no_terminales), len(no_terminales)), dtype=bool)
+    if gramatica.simbolo_inicial in fila:
+        directos[fila[gramatica.simbolo_inicial], columna['$']] = True
+
+    for nt in no_terminales:
+        for produccion in gramatica.obtener_producciones(nt):
+            # Se recorre de derecha a izquierda arrastrando lo visible tras cada posición.
+            visibles = []
+            sufijo_anulable = True
+            for simbolo in reversed(produccion):
+                if simbolo in fila:
+                    b = fila[simbolo]
+                    for siguiente in visibles:
+                        if siguiente in columna:
+                            directos[b, columna[siguiente]] = True
+                        else:
+                            seguido_de[b, fila[siguiente]] = True
+                    if sufijo_anulable:
+                        termina_en[b, fila[nt]] = True
+                    if simbolo not in anulables:
+                        visibles = [simbolo]
+                        sufijo_anulable = False
+                    else:
+                        visibles.append(simbolo)
+                elif simbolo in columna:
+                    visibles = [simbolo]
+                    sufijo_anulable = False
+
+    matriz_first = np.zeros((len(no_terminales), len(terminales)), dtype=np.float32)
+    for nt, conjunto in first.items():
+        for t in conjunto:
+            if t in columna:
+                matriz_first[fila[nt], columna[t]] = 1
+
+    iniciales = directos | ((seguido_de.astype(np.float32) @ matriz_first) > 0)
+    follow = (_clausura(termina_en).astype(np.float32) @ iniciales.astype(np.float32)) > 0
+    return _a_conjuntos(follow, no_terminales, terminales)
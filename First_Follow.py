@@ -8,6 +8,10 @@ y ascendentes (como SLR(1)).
 
 - First(X): Conjunto de terminales con los que puede comenzar una cadena derivada de X.
 - Follow(A): Conjunto de terminales que pueden aparecer inmediatamente después de A.
+
+Hay dos backends de cálculo con resultados idénticos: 'iterativo' (por defecto,
+sin dependencias) y 'matricial' (ver `FirstFollowMatricial`, requiere NumPy),
+pensado para gramáticas con miles de no terminales.
 """
 
 class First_Follow:
@@ -22,10 +26,16 @@ class First_Follow:
         gramatica: La gramática libre de contexto a analizar.
         first (dict): Diccionario que mapea cada no terminal a su conjunto First.
         follow (dict): Diccionario que mapea cada no terminal a su conjunto Follow.
+        backend (str): 'iterativo' o 'matricial'.
     """
-    def __init__(self, gramatica):
-        """Inicializa la calculadora con una gramática."""
+    BACKENDS = ('iterativo', 'matricial')
+
+    def __init__(self, gramatica, backend='iterativo'):
+        """Inicializa la calculadora con una gramática y el backend de cálculo."""
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Backend desconocido: {backend!r}. Opciones: {', '.join(self.BACKENDS)}.")
         self.gramatica = gramatica
+        self.backend = backend
         self.first = {}
         self.follow = {}
 
@@ -40,6 +50,11 @@ class First_Follow:
         Returns:
             dict: El diccionario de conjuntos First.        
         """
+        if self.backend == 'matricial':
+            import FirstFollowMatricial
+            self.first = FirstFollowMatricial.calcular_first(self.gramatica)
+            return self.first
+
         # Inicializa un conjunto vacío para cada no terminal.
         for nt in self.gramatica.no_terminales:
             self.first[nt] = set()
@@ -103,42 +118,50 @@ class First_Follow:
         """
         Calcula los conjuntos Follow para todos los no terminales.
 
-        Este algoritmo también es iterativo y se basa en tres reglas principales:
+        Se basa en tres reglas principales:
         1. Follow(SímboloInicial) siempre contiene '$'.
         2. Para una producción A -> aBb, First(b) (excepto 'e') está en Follow(B).
         3. Si b puede derivar en 'e', entonces Follow(A) está en Follow(B).
 
+        Las reglas 2 y 3 se evalúan una sola vez por ocurrencia, recorriendo el
+        índice `ocurrencias` de la gramática. La regla 3 produce inclusiones
+        Follow(A) ⊆ Follow(B) que se propagan con una lista de trabajo: solo se
+        revisan los dependientes de los conjuntos que acaban de crecer.
+
         Returns:
             dict: El diccionario de conjuntos Follow
         """
+        if self.backend == 'matricial':
+            import FirstFollowMatricial
+            self.follow = FirstFollowMatricial.calcular_follow(self.gramatica, self.first)
+            return self.follow
+
         # Inicializa los conjuntos y aplica la Regla 1.
         for nt in self.gramatica.no_terminales:
             self.follow[nt] = set()
         self.follow[self.gramatica.simbolo_inicial].add('$')
 
-        # Itera hasta la convergencia de los conjuntos.
-        cambio = True
-        while cambio:
-            cambio = False
-            for nt in self.gramatica.no_terminales:
-                for produccion in self.gramatica.obtener_producciones(nt):
-                    for i, simbolo in enumerate(produccion):
-                        if simbolo in self.gramatica.no_terminales:
-                            tamaño_anterior = len(self.follow[simbolo])
-                            
-                            # Beta es la secuencia de símbolos después del no terminal actual.
-                            beta = produccion[i+1:]
-                            
-                            # Aplica la Regla 2.
-                            first_beta = self._first_de_cadena(beta)
-                            self.follow[simbolo].update(first_beta - {'e'})
-                            
-                            # Aplica la Regla 3.
-                            if 'e' in first_beta or not beta:
-                                self.follow[simbolo].update(self.follow[nt])
-                            
-                            if len(self.follow[simbolo]) > tamaño_anterior:
-                                cambio = True
+        # Aplica la Regla 2 y registra las inclusiones de la Regla 3.
+        dependientes = {nt: set() for nt in self.gramatica.no_terminales}
+        ocurrencias = self.gramatica.ocurrencias
+        producciones_por_id = self.gramatica.producciones_por_id
+        for simbolo in self.gramatica.no_terminales:
+            for id_produccion, posicion in ocurrencias.get(simbolo, ()):
+                nt, produccion = producciones_por_id[id_produccion]
+                # Beta es la secuencia de símbolos después del no terminal actual.
+                first_beta = self._first_de_cadena(produccion[posicion + 1:])
+                self.follow[simbolo].update(first_beta - {'e'})
+                if 'e' in first_beta and nt != simbolo:
+                    dependientes[nt].add(simbolo)
+
+        # Propaga la Regla 3 hasta la convergencia.
+        pendientes = list(self.gramatica.no_terminales)
+        while pendientes:
+            nt = pendientes.pop()
+            for simbolo in dependientes[nt]:
+                if not self.follow[nt] <= self.follow[simbolo]:
+                    self.follow[simbolo] |= self.follow[nt]
+                    pendientes.append(simbolo)
         
         return self.follow
 
@@ -6,11 +6,19 @@ almacenar, procesar y proporcionar acceso a los componentes de una gramática,
 tales como producciones, símbolos terminales y no terminales.
 
 Funcionalidades clave:
-- Parseo de gramáticas desde la entrada estándar.
+- Parseo de gramáticas desde la entrada estándar o desde un archivo.
+- Carga masiva de una gramática completa desde un archivo o flujo, con
+  detección de producciones duplicadas.
 - Clasificación automática de símbolos.
-- Estructura de datos optimizada para el acceso a producciones.
+- Índices para los algoritmos: ids estables de producción, tabla de símbolos
+  con ids enteros y un índice inverso de ocurrencias en los lados derechos.
 """
 
+import hashlib
+import sys
+from itertools import islice
+
+
 class Gramatica:
     """
     Representa una Gramática Libre de Contexto (CFG).
@@ -26,6 +34,20 @@ class Gramatica:
         no_terminales (set): Un conjunto que contiene todos los símbolos no terminales.
         terminales (set): Un conjunto que contiene todos los símbolos terminales.
         simbolo_inicial (str): El símbolo inicial de la gramática.
+        producciones_por_id (list): Las producciones (no_terminal, produccion) en
+            orden de inserción; la posición es el id estable de la producción.
+        ids_producciones (dict): Mapeo de cada no terminal a los ids de sus producciones.
+        simbolos (list[str]): La tabla de símbolos; la posición es el id del símbolo.
+        id_simbolo (dict): Mapeo inverso de símbolo a su id entero.
+        ocurrencias (dict): Mapeo de cada símbolo a sus ocurrencias en lados
+            derechos, como pares (id de producción, posición).
+            Este índice, `producciones_por_id`, `ids_producciones`, `simbolos`
+            e `id_simbolo` se construyen juntos en la primera consulta tras
+            añadir producciones.
+        duplicadas (list): Las producciones (no_terminal, produccion) descartadas
+            por repetir una ya existente.
+        huella (str): La huella SHA-256 de la gramática, calculada en la primera
+            consulta tras añadir producciones o cambiar el símbolo inicial.
     """
     def __init__(self):
         """Inicializa una gramática vacía."""
@@ -33,34 +55,184 @@ class Gramatica:
         self.no_terminales = set()
         self.terminales = set()
         self.simbolo_inicial = 'S'  # Valor por defecto, se sobrescribe durante el parseo.
+        self.duplicadas = []
+        # Por no terminal, la clave de cada producción (ver `_clave`) y su id.
+        self._id_por_produccion = {}
+        self._numero_producciones = 0
+        self._indices = None
+        self._huella = None  # (símbolo inicial, huella) de la última consulta.
 
     def agregar_produccion(self, no_terminal, produccion):
         """
         Añade una regla de producción y actualiza los conjuntos de símbolos.
 
-        Este método es el único punto de entrada para añadir producciones,
-        asegurando que la gramática se mantenga consistente.
+        Junto con `parsear_lineas`, es el único punto de entrada para añadir
+        producciones, asegurando que la gramática y sus índices se mantengan
+        consistentes.
+        Una producción idéntica a otra ya existente no se añade de nuevo: se
+        registra en `duplicadas`.
 
         Args:
             no_terminal (str): El no terminal del lado izquierdo de la producción.
             produccion (list[str]): La secuencia de símbolos en el lado derecho.
+
+        Returns:
+            int: El id de la producción (el de la existente, si es duplicada).
         """
-        # Asegura que el no terminal tenga una entrada en el diccionario.
-        if no_terminal not in self.producciones:
-            self.producciones[no_terminal] = []
+        vistas = self._vistas(no_terminal)
+        clave = self._clave(produccion)
+        id_produccion = vistas.get(clave)
+        if id_produccion is not None:
+            self.duplicadas.append((no_terminal, produccion))
+            return id_produccion
+
+        id_produccion = vistas[clave] = self._numero_producciones
+        self._numero_producciones += 1
         self.producciones[no_terminal].append(produccion)
-        self.no_terminales.add(no_terminal)
+        self._indices = None
+        self._huella = None
+        self._clasificar(produccion)
+        return id_produccion
+
+    @staticmethod
+    def _clave(produccion):
+        """
+        Devuelve la clave con la que se detectan producciones duplicadas.
 
-        # Identifica y registra los símbolos terminales basándose en la convención
-        # de que los terminales son minúsculas o símbolos no alfabéticos.
-        for simbolo in produccion:
+        Si todos los símbolos son de un carácter, la producción se representa
+        por su texto, que es como la lee `parsear_lineas`; si no, por la tupla
+        de sus símbolos. Un texto nunca es igual a una tupla, así que ambas
+        formas no se confunden.
+        """
+        if all(len(simbolo) == 1 for simbolo in produccion):
+            return ''.join(produccion)
+        return tuple(produccion)
+
+    def _vistas(self, no_terminal):
+        """Devuelve las claves ya vistas de un no terminal, dándolo de alta si es nuevo."""
+        vistas = self._id_por_produccion.get(no_terminal)
+        if vistas is None:
+            vistas = self._id_por_produccion[no_terminal] = {}
+            self.producciones[no_terminal] = []
+            self.no_terminales.add(no_terminal)
+        return vistas
+
+    def _clasificar(self, simbolos):
+        """
+        Registra como terminales los símbolos que lo son, según la convención
+        de que los terminales son minúsculas o símbolos no alfabéticos.
+        """
+        for simbolo in simbolos:
             if simbolo != 'e' and not simbolo.isupper() and simbolo != '$':
                 self.terminales.add(simbolo)
 
+    def _indexar(self):
+        """
+        Construye los índices derivados en una sola pasada sobre las producciones.
+
+        Los ids de símbolo siguen el orden de primera aparición: cada no
+        terminal al añadirse su primera producción y cada símbolo al aparecer
+        por primera vez en un lado derecho.
+
+        Returns:
+            tuple: (producciones_por_id, ids_producciones, simbolos, id_simbolo, ocurrencias).
+        """
+        # Las producciones de cada no terminal están en el mismo orden que sus ids.
+        producciones_por_id = [None] * self._numero_producciones
+        for no_terminal, vistas in self._id_por_produccion.items():
+            for id_produccion, produccion in zip(vistas.values(), self.producciones[no_terminal]):
+                producciones_por_id[id_produccion] = (no_terminal, produccion)
+
+        ids_producciones = {}
+        simbolos = []
+        id_simbolo = {}
+        ocurrencias = {}
+        for id_produccion, (no_terminal, produccion) in enumerate(producciones_por_id):
+            ids = ids_producciones.get(no_terminal)
+            if ids is None:
+                ids = ids_producciones[no_terminal] = []
+                if no_terminal not in id_simbolo:
+                    id_simbolo[no_terminal] = len(simbolos)
+                    simbolos.append(no_terminal)
+            ids.append(id_produccion)
+            for posicion, simbolo in enumerate(produccion):
+                lista = ocurrencias.get(simbolo)
+                if lista is None:
+                    lista = ocurrencias[simbolo] = []
+                    if simbolo not in id_simbolo:
+                        id_simbolo[simbolo] = len(simbolos)
+                        simbolos.append(simbolo)
+                lista.append((id_produccion, posicion))
+        self._indices = (producciones_por_id, ids_producciones, simbolos, id_simbolo, ocurrencias)
+        return self._indices
+
+    @property
+    def producciones_por_id(self):
+        """list: Las producciones (no_terminal, produccion); la posición es su id."""
+        return (self._indices or self._indexar())[0]
+
+    @property
+    def ids_producciones(self):
+        """dict: Mapeo de cada no terminal a los ids de sus producciones."""
+        return (self._indices or self._indexar())[1]
+
+    @property
+    def simbolos(self):
+        """list[str]: La tabla de símbolos; la posición es el id del símbolo."""
+        return (self._indices or self._indexar())[2]
+
+    @property
+    def id_simbolo(self):
+        """dict: Mapeo inverso de símbolo a su id entero."""
+        return (self._indices or self._indexar())[3]
+
+    @property
+    def ocurrencias(self):
+        """dict: Mapeo de cada símbolo a sus ocurrencias (id de producción, posición)."""
+        return (self._indices or self._indexar())[4]
+
+    @property
+    def huella(self):
+        """
+        Huella (SHA-256) de la gramática, en hexadecimal.
+
+        No depende del orden en que se añadieron los no terminales ni sus
+        producciones. Se guarda junto al símbolo inicial con el que se calculó.
+        """
+        if self._huella is None or self._huella[0] != self.simbolo_inicial:
+            partes = [self.simbolo_inicial]
+            for nt in sorted(self.producciones):
+                for produccion in sorted(self.producciones[nt]):
+                    partes.append(nt + '\x1f' + '\x1f'.join(produccion))
+            self._huella = (self.simbolo_inicial,
+                            hashlib.sha256('\x1e'.join(partes).encode('utf-8')).hexdigest())
+        return self._huella[1]
+
     def parsear_entrada(self):
         """
         Parsea una gramática desde la entrada estándar.
 
+        Lee únicamente las líneas de la gramática, de modo que el resto de la
+        entrada estándar queda disponible para las cadenas a analizar.
+        Ver `parsear_lineas` para el formato.
+        """
+        self.parsear_lineas(self._lineas_entrada())
+
+    @staticmethod
+    def _lineas_entrada():
+        """
+        Devuelve un iterador, bajo demanda, de las líneas de la entrada estándar hasta EOF.
+
+        Se lee con `sys.stdin.readline` y no con `input()`, que vacía stdout y
+        stderr en cada llamada. Las líneas que no se piden quedan en el buffer
+        de `sys.stdin` para las lecturas posteriores.
+        """
+        return iter(sys.stdin.readline, '')
+
+    def parsear_lineas(self, lineas):
+        """
+        Parsea una gramática desde cualquier iterable de líneas (p. ej. un archivo).
+
         El método lee la definición de la gramática, que consiste en el número
         de reglas seguido de las reglas mismas. Es flexible y soporta dos
         formatos comunes para definir las producciones.
@@ -70,20 +242,26 @@ class Gramatica:
         2. "A a b c": Un no terminal seguido de sus producciones.
 
         El primer no terminal leído se establece como el símbolo inicial.
+
+        Args:
+            lineas (iterable[str]): Las líneas de la gramática. Solo se consumen
+                las necesarias.
         """
+        lineas = iter(lineas)
         try:
-            n = int(input().strip())
-        except (ValueError, EOFError):
+            n = int(next(lineas).strip())
+        except (ValueError, StopIteration):
             n = 0
             
         primer_no_terminal = None
+        textos = []
+        id_por_produccion = self._id_por_produccion
+        producciones = self.producciones
+        duplicadas = self.duplicadas
+        numero = self._numero_producciones
 
-        for _ in range(n):
-            try:
-                linea = input().strip()
-            except EOFError:
-                break
-
+        for linea in islice(lineas, n):
+            linea = linea.strip()
             if not linea:
                 continue
 
@@ -103,9 +281,27 @@ class Gramatica:
             if primer_no_terminal is None:
                 primer_no_terminal = no_terminal
 
+            # Registro de las producciones de la línea, como en `agregar_produccion`;
+            # el texto de cada una es su clave (ver `_clave`).
+            vistas = id_por_produccion.get(no_terminal)
+            if vistas is None:
+                vistas = self._vistas(no_terminal)
+            lista = producciones[no_terminal]
             for prod_str in producciones_str:
                 produccion = list(prod_str) if prod_str != 'e' else ['e']
-                self.agregar_produccion(no_terminal, produccion)
+                if prod_str in vistas:
+                    duplicadas.append((no_terminal, produccion))
+                    continue
+                vistas[prod_str] = numero
+                numero += 1
+                lista.append(produccion)
+            textos.extend(producciones_str)
+
+        self._numero_producciones = numero
+        self._indices = None
+        self._huella = None
+        # Los símbolos se clasifican en una sola pasada sobre todo lo leído.
+        self._clasificar(set(''.join(textos)))
 
         if primer_no_terminal:
             self.simbolo_inicial = primer_no_terminal
@@ -113,6 +309,39 @@ class Gramatica:
         # El símbolo '$' se añade explícitamente para representar el fin de la cadena.
         self.terminales.add('$')
 
+    def cargar(self, flujo):
+        """
+        Carga una gramática completa desde un flujo de texto (p. ej. `sys.stdin`).
+
+        El contenido se lee de una sola vez. La línea con el número de reglas
+        es opcional: si la primera línea no es un número, todas las líneas se
+        consideran reglas. Ver `parsear_lineas` para el formato.
+
+        Args:
+            flujo: Un objeto con método `read()` que devuelve texto.
+
+        Returns:
+            int: El número de producciones duplicadas descartadas.
+        """
+        lineas = flujo.read().splitlines()
+        if lineas and not lineas[0].strip().isdigit():
+            lineas.insert(0, str(len(lineas)))
+        self.parsear_lineas(lineas)
+        return len(self.duplicadas)
+
+    def cargar_archivo(self, ruta):
+        """
+        Carga una gramática completa desde un archivo. Ver `cargar`.
+
+        Args:
+            ruta (str): La ruta del archivo, en UTF-8.
+
+        Returns:
+            int: El número de producciones duplicadas descartadas.
+        """
+        with open(ruta, encoding='utf-8') as archivo:
+            return self.cargar(archivo)
+
     def obtener_producciones(self, no_terminal):
         """
         Devuelve todas las producciones para un no terminal dado.
@@ -19,23 +19,28 @@ class ItemLR0:
         no_terminal (str): El no terminal de la producción.
         produccion (list[str]): La lista de símbolos de la producción.
         posicion_punto (int): El índice que indica la posición del punto.
+        id_produccion (int): El id de la producción en la gramática, o None.
+            Cuando se indica, la igualdad y el hash usan solo (id, punto).
     """
-    def __init__(self, no_terminal, produccion, posicion_punto):
+    def __init__(self, no_terminal, produccion, posicion_punto, id_produccion=None):
         """Inicializa un item LR(0)."""
         self.no_terminal = no_terminal
         self.produccion = produccion
         self.posicion_punto = posicion_punto
+        self.id_produccion = id_produccion
+        if id_produccion is None:
+            self._clave = (no_terminal, tuple(produccion), posicion_punto)
+        else:
+            self._clave = (id_produccion, posicion_punto)
+        self._hash = hash(self._clave)
 
     def __eq__(self, otro):
         """Compara dos items para ver si son idénticos."""
-        return (isinstance(otro, ItemLR0) and
-                self.no_terminal == otro.no_terminal and
-                self.produccion == otro.produccion and
-                self.posicion_punto == otro.posicion_punto)
+        return isinstance(otro, ItemLR0) and self._clave == otro._clave
 
     def __hash__(self):
-        """Genera un hash para el item, permitiendo su uso en conjuntos."""
-        return hash((self.no_terminal, tuple(self.produccion), self.posicion_punto))
+        """Devuelve el hash del item, calculado una sola vez al crearlo."""
+        return self._hash
 
     def __repr__(self):
         """Devuelve una representación legible del item, ej: "A -> a·b"."""
@@ -64,7 +69,7 @@ class ItemLR0:
             ItemLR0 or None: El nuevo item si es posible avanzar, o None.
         """
         if self.posicion_punto < len(self.produccion):
-            return ItemLR0(self.no_terminal, self.produccion, self.posicion_punto + 1)
+            return ItemLR0(self.no_terminal, self.produccion, self.posicion_punto + 1, self.id_produccion)
         return None
 
 
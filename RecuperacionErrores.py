@@ -0,0 +1,371 @@
+"""
+Recuperación de Errores Sintácticos
+
+Este módulo permite informar de todos los errores sintácticos de una cadena en
+una sola pasada, en lugar de detenerse en el primero como `analizar`:
+
+- LL(1): modo pánico. Ante un no terminal sin entrada en la tabla, o un
+  terminal que no coincide, se descartan símbolos de la entrada hasta uno de
+  sincronización: los de FIRST del tope, con los que se sigue, o los que
+  admite el resto de la pila (la parte de FOLLOW del tope alcanzable en ese
+  contexto), con los que se desapila el tope como si se hubiese insertado. Al
+  llegar al '$' final se desapila todo lo pendiente.
+- SLR(1): se descartan símbolos de la entrada y se desapilan estados hasta
+  uno que admita el símbolo actual, directamente o tras apilar su transición
+  IR_A por algún no terminal (como si se hubiese reducido). Con una
+  anticipación acotada a `ventana` símbolos se prefiere la reanudación desde
+  la que los siguientes se analizan sin error, lo que evita muchos errores en
+  cascada. Si un error se repite en la posición donde se
+  acaba de reanudar, el siguiente intento descarta al menos un símbolo, de modo
+  que el análisis siempre avanza. Tras reanudar, la pila puede no ser una de
+  las que produce una cadena válida: las reducciones que desapilarían el fondo,
+  o que se encadenan más de lo posible sin consumir un símbolo (ciclos como
+  A -> A), se tratan como un error.
+
+Los conjuntos de símbolos esperados (por estado o por fila de la tabla) y los
+usados para sincronizar se calculan una sola vez, al crear el objeto de
+recuperación: informar de un error solo cuesta registrarlo y recorrer la parte
+de la pila o de la entrada que decide dónde seguir, y el análisis sin errores
+(`analizar`) no se ve afectado.
+"""
+
+
+class ErrorSintactico:
+    """
+    Describe un error sintáctico encontrado durante el análisis.
+
+    Los errores en cascada (varios en la misma posición antes de consumir
+    ningún símbolo) se agrupan en uno solo.
+
+    Atributos:
+        posicion (int): Índice en la cadena del símbolo erróneo; la longitud
+            de la cadena si el error está en el '$' final.
+        encontrado (str): El símbolo encontrado ('$' si la cadena terminó antes de tiempo).
+        esperados (frozenset): Los símbolos que se admitían en esa posición.
+        descartados (int): Símbolos de la entrada descartados para recuperarse.
+    """
+    __slots__ = ('posicion', 'encontrado', 'esperados', 'descartados')
+
+    def __init__(self, posicion, encontrado, esperados, descartados=0):
+        """Inicializa la descripción del error."""
+        self.posicion = posicion
+        self.encontrado = encontrado
+        self.esperados = esperados
+        self.descartados = descartados
+
+    def __repr__(self):
+        """Devuelve una descripción legible, ej: "Posición 3: se encontró ')', se esperaba uno de: (, i"."""
+        texto = f"Posición {self.posicion}: se encontró {self.encontrado!r}, "
+        if self.esperados:
+            texto += f"se esperaba uno de: {', '.join(sorted(self.esperados))}"
+        else:
+            texto += "no se esperaba ningún símbolo"
+        if self.descartados:
+            texto += f" ({self.descartados} símbolos descartados)"
+        return texto
+
+
+def _registrar(errores, posicion, encontrado, esperados, descartados):
+    """Añade un error, o lo agrupa con el anterior si ocurre en la misma posición."""
+    if errores and errores[-1].posicion == posicion:
+        errores[-1].descartados += descartados
+    else:
+        errores.append(ErrorSintactico(posicion, encontrado, esperados, descartados))
+
+
+class RecuperacionLL1:
+    """
+    Análisis LL(1) con recuperación de errores en modo pánico.
+
+    Atributos:
+        analizador: El `AnalizadorLL1` de origen.
+        version (int): La versión de la tabla con la que se calcularon los conjuntos.
+        esperados (dict): Para cada no terminal, los terminales con entrada en su fila.
+        primeros (dict): Para cada no terminal, FIRST - {'e'}.
+        anulables (set): Los no terminales cuyo FIRST contiene 'e'.
+        inicios (dict): Para cada símbolo, los terminales con los que puede empezar
+            (FIRST - {'e'} de un no terminal; el propio símbolo si es terminal o '$').
+    """
+    def __init__(self, analizador):
+        """Precalcula los conjuntos de símbolos esperados y de sincronización."""
+        self.analizador = analizador
+        self.version = analizador.version
+        gramatica = analizador.gramatica
+        first = analizador.first_follow.first
+
+        filas = {nt: set() for nt in gramatica.no_terminales}
+        for nt, terminal in analizador.tabla_analisis:
+            filas[nt].add(terminal)
+        self.esperados = {nt: frozenset(fila) for nt, fila in filas.items()}
+        self.primeros = {nt: frozenset(first.get(nt, set()) - {'e'}) for nt in gramatica.no_terminales}
+        self.anulables = {nt for nt in gramatica.no_terminales if 'e' in first.get(nt, ())}
+        self.inicios = {t: frozenset((t,)) for t in gramatica.terminales | {'$'}}
+        self.inicios.update(self.primeros)
+        self._uniones = {}
+
+    def _contexto(self, simbolo, debajo):
+        """
+        Calcula los terminales que admite la pila tras apilar `simbolo`.
+
+        Es FIRST de la pila leída desde el tope: los inicios de `simbolo` y, si
+        es anulable, también `debajo`, lo que admitía la pila antes de apilarlo.
+        Las uniones se memorizan, pues los contextos distintos son pocos.
+        """
+        inicios = self.inicios.get(simbolo, frozenset())
+        if simbolo not in self.anulables:
+            return inicios
+        clave = (simbolo, debajo)
+        union = self._uniones.get(clave)
+        if union is None:
+            union = self._uniones[clave] = inicios | debajo
+        return union
+
+    def analizar(self, cadena_entrada):
+        """
+        Analiza una cadena recuperándose de cada error.
+
+        Args:
+            cadena_entrada (str): La cadena a analizar.
+
+        Returns:
+            list[ErrorSintactico]: Los errores encontrados; vacía si la cadena es aceptada.
+        """
+        terminales = self.analizador.gramatica.terminales
+        no_terminales = self.analizador.gramatica.no_terminales
+        tabla_analisis = self.analizador.tabla_analisis
+        contexto = self._contexto
+        entrada = cadena_entrada + '$'
+        pila = ['$', self.analizador.gramatica.simbolo_inicial]
+        # `contextos[i]` son los terminales que admite `pila[:i + 1]` leída desde
+        # su tope; se mantiene junto a la pila para consultarlo en O(1).
+        contextos = [self.inicios['$']]
+        contextos.append(contexto(pila[1], contextos[0]))
+        indice = 0
+        errores = []
+
+        while pila:
+            tope = pila[-1]
+            simbolo = entrada[indice]
+
+            if tope in no_terminales:
+                produccion = tabla_analisis.get((tope, simbolo))
+                # Una producción vacía elegida por FOLLOW solo se aplica si el
+                # contexto admite el símbolo; si no, el error se detecta aquí.
+                if produccion is not None and (simbolo in self.primeros[tope]
+                                               or (len(pila) > 1 and simbolo in contextos[-2])):
+                    pila.pop()
+                    contextos.pop()
+                    if produccion != ['e']:
+                        for s in reversed(produccion):
+                            contextos.append(contexto(s, contextos[-1]))
+                            pila.append(s)
+                    continue
+                esperados, primeros = self.esperados[tope], self.primeros[tope]
+            elif tope == simbolo:
+                pila.pop()
+                contextos.pop()
+                indice += 1
+                if not pila and indice < len(entrada):
+                    # Un '$' dentro de la cadena cerró la derivación: el resto sobra.
+                    _registrar(errores, indice, entrada[indice], frozenset(), len(entrada) - 1 - indice)
+                continue
+            elif tope in terminales or tope == '$':
+                esperados = primeros = frozenset((tope,))
+            else:
+                esperados = primeros = frozenset()  # Símbolo inesperado en la pila.
+
+            # Modo pánico: se descarta hasta un símbolo con el que pueda seguir el
+            # tope o, si no, lo que hay bajo él; el '$' final nunca se descarta.
+            continuaciones = contextos[-2] if len(pila) > 1 else frozenset()
+            if tope in self.anulables:
+                # La fila de la tabla incluye todo FOLLOW; el contexto es más preciso.
+                esperados = primeros | continuaciones
+            siguiente = indice
+            while (siguiente < len(entrada) - 1 and entrada[siguiente] not in primeros
+                   and entrada[siguiente] not in continuaciones):
+                siguiente += 1
+            _registrar(errores, indice, simbolo, esperados, siguiente - indice)
+            indice = siguiente
+            if entrada[indice] not in primeros:
+                pila.pop()
+                contextos.pop()
+
+        return errores
+
+
+class RecuperacionSLR1:
+    """
+    Análisis SLR(1) con recuperación por desapilado de estados y descarte acotado.
+
+    Atributos:
+        analizador: El `AnalizadorSLR1` de origen.
+        version (int): La versión de las tablas con la que se calcularon los conjuntos.
+        ventana (int): Anticipación de la búsqueda: símbolos examinados en busca de
+            una reanudación sin errores, y símbolos que deben analizarse sin error tras ella.
+        max_desapilados (int): Estados del tope de la pila examinados al buscar
+            dónde reanudar; además siempre se examina el estado del fondo.
+        max_reducciones (int): Reducciones seguidas sin consumir un símbolo que se
+            admiten, además de la altura de la pila, antes de darlas por un ciclo.
+        esperados (list[frozenset]): Para cada estado, los terminales con acción definida.
+        reanudacion (list[dict]): Para cada estado s, el mapeo de cada terminal t
+            al estado IR_A(s, A) desde el que t tiene acción, para algún no terminal A.
+    """
+    def __init__(self, analizador, ventana=3, max_desapilados=64):
+        """Precalcula los conjuntos de símbolos esperados y de reanudación por estado."""
+        self.analizador = analizador
+        self.version = analizador.version
+        self.ventana = ventana
+        self.max_desapilados = max_desapilados
+        # Cada reducción que no desapila (vacía o unitaria) lleva a otro estado;
+        # una cadena válida no las encadena más que estados por posición de la pila.
+        longitud_maxima = max((len(p) for _, p in analizador.gramatica.producciones_por_id), default=1)
+        self.max_reducciones = len(analizador.estados) * max(longitud_maxima, 1)
+
+        filas = [set() for _ in analizador.estados]
+        for estado, terminal in analizador.accion:
+            filas[estado].add(terminal)
+        self.esperados = [frozenset(fila) for fila in filas]
+
+        self.reanudacion = [{} for _ in analizador.estados]
+        for (estado, _), destino in analizador.ir_a.items():
+            for terminal in filas[destino]:
+                self.reanudacion[estado].setdefault(terminal, destino)
+
+    def analizar(self, cadena_entrada):
+        """
+        Analiza una cadena recuperándose de cada error.
+
+        Args:
+            cadena_entrada (str): La cadena a analizar.
+
+        Returns:
+            list[ErrorSintactico]: Los errores encontrados; vacía si la cadena es aceptada.
+        """
+        accion_de, ir_a = self.analizador.accion, self.analizador.ir_a
+        entrada = cadena_entrada + '$'
+        pila = [0]
+        indice = 0
+        reanudado_en = -1
+        errores = []
+        # Reducciones admitidas antes de consumir el símbolo actual (ver `max_reducciones`).
+        reducciones = 1 + self.max_reducciones
+
+        while True:
+            simbolo = entrada[indice]
+            accion = accion_de.get((pila[-1], simbolo))
+            if accion == 'aceptar':
+                return errores
+
+            if accion is not None and accion[0] == 'desplazar':
+                pila.append(accion[1])
+                indice += 1
+                reducciones = len(pila) + self.max_reducciones
+                continue
+
+            if accion is not None:
+                no_terminal, produccion = accion[1], accion[2]
+                longitud = len(produccion) if produccion != ['e'] else 0
+                reducciones -= 1
+                if longitud < len(pila) and reducciones >= 0:
+                    del pila[len(pila) - longitud:]
+                    destino = ir_a.get((pila[-1], no_terminal))
+                    if destino is not None:
+                        pila.append(destino)
+                        continue
+
+            # Error: si se repite donde se acaba de reanudar, hay que descartar algo.
+            esperados = self.esperados[pila[-1]]
+            reanudacion = self._reanudar(pila, entrada, indice, 1 if indice == reanudado_en else 0)
+            if reanudacion is None:
+                _registrar(errores, indice, simbolo, esperados, len(entrada) - 1 - indice)
+                return errores
+            siguiente, profundidad, destino = reanudacion
+            _registrar(errores, indice, simbolo, esperados, siguiente - indice)
+            del pila[profundidad + 1:]
+            if destino is not None:
+                pila.append(destino)
+            indice = reanudado_en = siguiente
+            reducciones = len(pila) + self.max_reducciones
+
+    def _reanudar(self, pila, entrada, indice, minimo):
+        """
+        Busca dónde reanudar el análisis tras un error.
+
+        Recorre la entrada desde `indice + minimo` y, para cada símbolo, los
+        `max_desapilados` estados del tope de la pila y el del fondo, de modo
+        que el coste de cada símbolo examinado no depende de la profundidad. En
+        cada estado se prueba primero a continuar con el símbolo tal cual y
+        después a apilar un IR_A que lo admita. Dentro de los
+        `ventana` primeros símbolos se prefiere una reanudación desde la que los
+        `ventana` siguientes se analizan sin error; si no la hay, se toma la
+        primera encontrada.
+
+        Returns:
+            tuple: (posición en la entrada, profundidad del estado en la pila,
+            estado a apilar o None), o None si no se puede reanudar antes del final.
+        """
+        accion_de, reanudacion = self.analizador.accion, self.reanudacion
+        primera = None
+        limite = indice + minimo + self.ventana
+        minima = max(len(pila) - 1 - self.max_desapilados, 0)
+        profundidades = list(range(len(pila) - 1, minima - 1, -1))
+        if minima > 0:
+            profundidades.append(0)
+        for posicion in range(indice + minimo, len(entrada)):
+            simbolo = entrada[posicion]
+            if primera is not None and posicion >= limite:
+                return primera
+            for profundidad in profundidades:
+                estado = pila[profundidad]
+                candidatos = []
+                if (estado, simbolo) in accion_de:
+                    candidatos.append(None)
+                destino = reanudacion[estado].get(simbolo)
+                if destino is not None:
+                    candidatos.append(destino)
+                for destino in candidatos:
+                    if posicion >= limite:
+                        return posicion, profundidad, destino
+                    if self._sin_errores(pila, profundidad, destino, entrada, posicion):
+                        return posicion, profundidad, destino
+                    if primera is None:
+                        primera = (posicion, profundidad, destino)
+        return primera
+
+    def _sin_errores(self, pila, profundidad, destino, entrada, posicion):
+        """
+        Comprueba si, tras reanudar, los `ventana` símbolos siguientes se analizan sin error.
+
+        La simulación no copia la pila: los estados apilados se guardan aparte y
+        las reducciones que bajan de ellos solo mueven el límite de la parte
+        compartida `pila[:base]`. Una reducción que desapilaría el fondo, o que
+        excede `max_reducciones`, cuenta como error.
+        """
+        accion_de, ir_a = self.analizador.accion, self.analizador.ir_a
+        base = profundidad + 1
+        locales = [] if destino is None else [destino]
+        limite = min(posicion + self.ventana, len(entrada))
+        reducciones = base + len(locales) + self.max_reducciones
+        while posicion < limite:
+            accion = accion_de.get((locales[-1] if locales else pila[base - 1], entrada[posicion]))
+            if accion is None:
+                return False
+            if accion == 'aceptar':
+                return True
+            if accion[0] == 'desplazar':
+                locales.append(accion[1])
+                posicion += 1
+                reducciones = base + len(locales) + self.max_reducciones
+                continue
+            reducciones -= 1
+            longitud = len(accion[2]) if accion[2] != ['e'] else 0
+            locales_quitados = min(longitud, len(locales))
+            if reducciones < 0 or longitud - locales_quitados >= base:
+                return False
+            del locales[len(locales) - locales_quitados:]
+            base -= longitud - locales_quitados
+            siguiente = ir_a.get((locales[-1] if locales else pila[base - 1], accion[1]))
+            if siguiente is None:
+                return False
+            locales.append(siguiente)
+        return True
@@ -0,0 +1,205 @@
+"""
+Registro de Gramáticas Compiladas
+
+Este módulo permite que un mismo proceso atienda muchas gramáticas distintas.
+Los analizadores LL(1) y SLR(1) de cada gramática se construyen bajo demanda y
+se guardan en una caché LRU acotada por tamaño, identificados por la huella
+de la gramática.
+
+Características:
+- Huella estable: dos gramáticas con las mismas producciones y el mismo símbolo
+  inicial comparten entrada, aunque se hayan creado por separado.
+- Contabilidad de tamaño basada en estados, items y entradas de las tablas.
+- Construcciones concurrentes de la misma gramática se unifican: solo un hilo
+  construye y el resto espera su resultado.
+- Estadísticas de aciertos, fallos, desalojos y construcciones unificadas.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from First_Follow import First_Follow
+from AnalizadorLL1 import AnalizadorLL1
+from AnalizadorSLR1 import AnalizadorSLR1
+
+
+def huella(gramatica):
+    """
+    Calcula la huella (SHA-256) de una gramática.
+
+    La huella no depende del orden en que se añadieron los no terminales ni
+    sus producciones. La gramática la guarda tras calcularla (ver
+    `Gramatica.huella`), así que las consultas repetidas no la recalculan.
+
+    Args:
+        gramatica: La `Gramatica` a identificar.
+
+    Returns:
+        str: La huella en hexadecimal.
+    """
+    return gramatica.huella
+
+
+class AnalizadoresCompilados:
+    """
+    Agrupa los analizadores construidos para una gramática.
+
+    Atributos:
+        gramatica: La gramática de origen.
+        first_follow: Los conjuntos FIRST y FOLLOW calculados.
+        ll1 (AnalizadorLL1): El analizador LL(1), con su tabla construida.
+        slr1 (AnalizadorSLR1): El analizador SLR(1), con sus tablas construidas.
+        tamaño (int): Tamaño estimado, en estados + items + entradas de tablas.
+    """
+    def __init__(self, gramatica):
+        """Calcula FIRST/FOLLOW y construye ambos analizadores para la gramática."""
+        self.gramatica = gramatica
+        self.first_follow = First_Follow(gramatica)
+        self.first_follow.calcular_first()
+        self.first_follow.calcular_follow()
+
+        self.ll1 = AnalizadorLL1(gramatica, self.first_follow)
+        self.ll1.construir_tabla_analisis()
+
+        self.slr1 = AnalizadorSLR1(gramatica, self.first_follow)
+        # Los conflictos se reflejan en `es_slr1`; no se imprimen al construir en segundo plano.
+        self.slr1.construir_tabla_analisis(mostrar_conflictos=False)
+
+        self.tamaño = (len(self.slr1.estados)
+                       + sum(len(estado.items) for estado in self.slr1.estados)
+                       + len(self.slr1.accion) + len(self.slr1.ir_a)
+                       + len(self.ll1.tabla_analisis))
+
+    def analizador(self):
+        """
+        Devuelve el analizador preferido para la gramática.
+
+        Returns:
+            El analizador SLR(1) si la gramática es compatible; si no, el LL(1)
+            si lo es; None si no es compatible con ninguno.
+        """
+        if self.slr1.es_slr1:
+            return self.slr1
+        if self.ll1.es_ll1:
+            return self.ll1
+        return None
+
+
+class RegistroGramaticas:
+    """
+    Caché LRU, segura entre hilos, de analizadores compilados por gramática.
+
+    Atributos:
+        capacidad (int): Tamaño total máximo (ver `AnalizadoresCompilados.tamaño`).
+            Una gramática que por sí sola supera la capacidad se conserva igualmente
+            mientras sea la más reciente.
+        aciertos (int): Consultas resueltas desde la caché.
+        fallos (int): Consultas que requirieron construir los analizadores.
+        desalojos (int): Entradas expulsadas para respetar la capacidad.
+        unificadas (int): Consultas que esperaron una construcción ya en curso.
+    """
+    def __init__(self, capacidad=1_000_000):
+        """Inicializa un registro vacío con la capacidad indicada."""
+        self.capacidad = capacidad
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.unificadas = 0
+        self._entradas = OrderedDict()
+        self._tamaño_total = 0
+        self._en_construccion = {}
+        self._candado = threading.Lock()
+
+    def obtener(self, gramatica):
+        """
+        Devuelve los analizadores de una gramática, construyéndolos si hace falta.
+
+        Args:
+            gramatica: La `Gramatica` cuyos analizadores se necesitan.
+
+        Returns:
+            AnalizadoresCompilados: Los analizadores de la gramática.
+        """
+        clave = huella(gramatica)
+        with self._candado:
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return entrada
+
+            futuro = self._en_construccion.get(clave)
+            if futuro is not None:
+                self.unificadas += 1
+                constructor = False
+            else:
+                futuro = Future()
+                self._en_construccion[clave] = futuro
+                self.fallos += 1
+                constructor = True
+
+        if not constructor:
+            return futuro.result()
+
+        # La construcción se hace fuera del candado para no bloquear otras gramáticas.
+        try:
+            entrada = AnalizadoresCompilados(gramatica)
+        except BaseException as error:
+            with self._candado:
+                del self._en_construccion[clave]
+            futuro.set_exception(error)
+            raise
+
+        with self._candado:
+            del self._en_construccion[clave]
+            self._entradas[clave] = entrada
+            self._tamaño_total += entrada.tamaño
+            self._desalojar()
+        futuro.set_result(entrada)
+        return entrada
+
+    def _desalojar(self):
+        """Expulsa las entradas menos recientes hasta respetar la capacidad."""
+        while self._tamaño_total > self.capacidad and len(self._entradas) > 1:
+            _, expulsada = self._entradas.popitem(last=False)
+            self._tamaño_total -= expulsada.tamaño
+            self.desalojos += 1
+
+    def descartar(self, gramatica):
+        """Elimina del registro los analizadores de una gramática, si existen."""
+        with self._candado:
+            entrada = self._entradas.pop(huella(gramatica), None)
+            if entrada is not None:
+                self._tamaño_total -= entrada.tamaño
+
+    def __contains__(self, gramatica):
+        """Indica si los analizadores de la gramática están en el registro."""
+        with self._candado:
+            return huella(gramatica) in self._entradas
+
+    def __len__(self):
+        """Devuelve el número de gramáticas en el registro."""
+        with self._candado:
+            return len(self._entradas)
+
+    def estadisticas(self):
+        """
+        Devuelve las estadísticas de uso del registro.
+
+        Returns:
+            dict: Aciertos, fallos, desalojos, construcciones unificadas, tasa de
+            aciertos, número de entradas y tamaño total ocupado.
+        """
+        with self._candado:
+            consultas = self.aciertos + self.fallos + self.unificadas
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'desalojos': self.desalojos,
+                'unificadas': self.unificadas,
+                'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+                'entradas': len(self._entradas),
+                'tamaño_total': self._tamaño_total,
+                'capacidad': self.capacidad,
+            }
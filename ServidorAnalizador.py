@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""
+Servicio de Análisis Sintáctico sobre Sockets
+
+Este módulo permite mantener gramáticas compiladas en memoria y atender
+solicitudes de análisis a través de un socket TCP o Unix, en lugar de lanzar
+`main.py` (y reconstruir la gramática) por cada consulta.
+
+Protocolo (una línea JSON por mensaje, en ambos sentidos):
+- Solicitud: {"id": 1, "gramatica": "expr", "analizador": "slr1", "cadenas": ["i+i", "i+"]}
+  El campo "analizador" ("ll1" o "slr1") es opcional; si se omite se usa SLR(1)
+  cuando la gramática lo admite y, si no, LL(1).
+- Respuesta: {"id": 1, "veredictos": [true, false]} o {"id": 1, "error": "..."}.
+
+Las solicitudes pueden enviarse encadenadas (pipelining) sin esperar las
+respuestas; éstas se devuelven en el mismo orden en que llegaron.
+
+El trabajo pesado se reparte en un pool de procesos cuyos trabajadores se
+adjuntan a las tablas publicadas en memoria compartida (ver `TablaCompartida`).
+La contrapresión se aplica en dos niveles: un límite global de lotes en curso
+y un límite de solicitudes pendientes por conexión; al alcanzarlo se deja de
+leer del socket.
+
+Uso:
+    python ServidorAnalizador.py servidor --gramatica expr=expr.txt --tcp 127.0.0.1:8765
+    python ServidorAnalizador.py cliente --tcp 127.0.0.1:8765 --gramatica expr i+i i+
+    python ServidorAnalizador.py carga --tcp 127.0.0.1:8765 --gramatica expr --cadenas cadenas.txt
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from Gramatica import Gramatica
+from RegistroGramaticas import AnalizadoresCompilados
+import TablaCompartida
+
+# Tamaño máximo de una línea del protocolo.
+LIMITE_LINEA = 64 * 1024 * 1024
+
+# Tablas adjuntas en cada proceso trabajador: (id_gramatica, tipo) -> tabla.
+_tablas_trabajador = {}
+
+
+def _iniciar_trabajador(bloques):
+    """Adjunta el proceso trabajador a todas las tablas publicadas."""
+    for clave, nombre in bloques.items():
+        _tablas_trabajador[clave] = TablaCompartida.adjuntar_memoria_compartida(nombre)
+
+
+def _analizar_lote(clave, cadenas):
+    """Analiza un lote de cadenas dentro de un proceso trabajador."""
+    tabla = _tablas_trabajador[clave]
+    return [tabla.analizar(cadena) for cadena in cadenas]
+
+
+def compilar_gramatica(ruta):
+    """
+    Lee una gramática desde un archivo y construye sus tablas compactas.
+
+    Args:
+        ruta (str): Archivo con la gramática, en el formato de `Gramatica.parsear_lineas`.
+
+    Returns:
+        dict: Mapeo de tipo de analizador ('ll1', 'slr1') a su tabla compacta,
+        solo para los analizadores compatibles con la gramática.
+    """
+    gramatica = Gramatica()
+    gramatica.cargar_archivo(ruta)
+    compilados = AnalizadoresCompilados(gramatica)
+
+    tablas = {}
+    if compilados.ll1.es_ll1:
+        tablas['ll1'] = compilados.ll1.comprimir_tabla()
+    if compilados.slr1.es_slr1:
+        tablas['slr1'] = compilados.slr1.comprimir_tabla()
+    return tablas
+
+
+class ServidorAnalizador:
+    """
+    Servidor asyncio que atiende solicitudes de análisis sobre gramáticas precargadas.
+
+    Atributos:
+        tablas (dict): Mapeo (id_gramatica, tipo) -> tabla compacta local.
+        procesos (int): Número de procesos trabajadores.
+        max_lotes (int): Máximo de lotes en curso en el pool (contrapresión global).
+        max_pendientes (int): Máximo de solicitudes pendientes por conexión.
+        umbral_en_linea (int): Los lotes con menos caracteres que este umbral se
+            analizan en el propio bucle de eventos, sin pasar por el pool.
+    """
+    def __init__(self, procesos=None, max_lotes=None, max_pendientes=64, umbral_en_linea=256):
+        """Inicializa un servidor sin gramáticas cargadas."""
+        self.tablas = {}
+        self.procesos = procesos or os.cpu_count() or 1
+        self.max_lotes = max_lotes or 4 * self.procesos
+        self.max_pendientes = max_pendientes
+        self.umbral_en_linea = umbral_en_linea
+        self._bloques = {}
+        self._pool = None
+        self._semaforo = None
+
+    def cargar_gramatica(self, id_gramatica, ruta):
+        """
+        Compila una gramática y registra sus tablas bajo un identificador.
+
+        Debe llamarse antes de `iniciar`.
+
+        Returns:
+            list[str]: Los tipos de analizador disponibles para la gramática.
+        """
+        tablas = compilar_gramatica(ruta)
+        for tipo, tabla in tablas.items():
+            self.tablas[(id_gramatica, tipo)] = tabla
+        return sorted(tablas)
+
+    def _resolver(self, solicitud):
+        """Determina la tabla que debe atender una solicitud."""
+        id_gramatica = solicitud.get('gramatica')
+        tipo = solicitud.get('analizador')
+        if tipo is None:
+            tipo = 'slr1' if (id_gramatica, 'slr1') in self.tablas else 'll1'
+        clave = (id_gramatica, tipo)
+        if clave not in self.tablas:
+            raise ValueError(f"No hay analizador {tipo} para la gramática {id_gramatica!r}.")
+        return clave
+
+    async def _atender(self, solicitud):
+        """Procesa una solicitud y devuelve el mensaje de respuesta."""
+        respuesta = {'id': solicitud.get('id')}
+        try:
+            clave = self._resolver(solicitud)
+            cadenas = solicitud.get('cadenas', [])
+            if not isinstance(cadenas, list) or not all(isinstance(c, str) for c in cadenas):
+                raise ValueError("El campo 'cadenas' debe ser una lista de cadenas de texto.")
+            if sum(len(c) for c in cadenas) < self.umbral_en_linea:
+                tabla = self.tablas[clave]
+                respuesta['veredictos'] = [tabla.analizar(c) for c in cadenas]
+            else:
+                async with self._semaforo:
+                    bucle = asyncio.get_running_loop()
+                    respuesta['veredictos'] = await bucle.run_in_executor(
+                        self._pool, _analizar_lote, clave, cadenas)
+        except (ValueError, TypeError) as error:
+            respuesta['error'] = str(error)
+        except Exception as error:
+            # Cualquier otro fallo (incluido un pool roto) se responde a esta
+            # solicitud sin cortar la conexión ni las solicitudes encadenadas.
+            respuesta['error'] = f"Error interno: {type(error).__name__}: {error}"
+        return respuesta
+
+    async def _conexion(self, lector, escritor):
+        """Atiende una conexión: lee solicitudes y responde en orden."""
+        pendientes = asyncio.Queue(maxsize=self.max_pendientes)
+
+        async def responder():
+            while True:
+                tarea = await pendientes.get()
+                if tarea is None:
+                    break
+                respuesta = await tarea
+                escritor.write(json.dumps(respuesta).encode('utf-8') + b'\n')
+                await escritor.drain()
+
+        async def encolar(tarea):
+            """Encola una tarea; falla si el cliente se fue mientras se esperaba sitio."""
+            colocar = asyncio.ensure_future(pendientes.put(tarea))
+            await asyncio.wait((colocar, respondedor, cerrada), return_when=asyncio.FIRST_COMPLETED)
+            if not colocar.done():
+                colocar.cancel()
+                if tarea is not None:
+                    tarea.cancel()
+                raise ConnectionResetError("El cliente cerró la conexión.")
+
+        respondedor = asyncio.create_task(responder())
+        cerrada = asyncio.ensure_future(escritor.wait_closed())
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                try:
+                    solicitud = json.loads(linea)
+                except json.JSONDecodeError:
+                    solicitud = None
+                if isinstance(solicitud, dict):
+                    tarea = asyncio.ensure_future(self._atender(solicitud))
+                else:
+                    tarea = asyncio.ensure_future(self._respuesta_invalida())
+                # Si la cola está llena se deja de leer del socket (contrapresión).
+                await encolar(tarea)
+            await encolar(None)
+            await respondedor
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            respondedor.cancel()
+            while not pendientes.empty():
+                tarea = pendientes.get_nowait()
+                if tarea is not None:
+                    tarea.cancel()
+            with contextlib.suppress(asyncio.CancelledError, ConnectionError):
+                await respondedor
+            escritor.close()
+            with contextlib.suppress(asyncio.CancelledError, ConnectionError):
+                await cerrada
+
+    @staticmethod
+    async def _respuesta_invalida():
+        """Respuesta para una línea que no es una solicitud JSON válida."""
+        return {'id': None, 'error': 'Solicitud mal formada.'}
+
+    async def iniciar(self, host=None, puerto=None, ruta_unix=None):
+        """
+        Publica las tablas, arranca el pool de procesos y atiende conexiones.
+
+        Se escucha en un socket Unix si se indica `ruta_unix`, y en TCP en caso contrario.
+        La función no retorna hasta que se cancela; al salir libera todos los recursos.
+        """
+        self._semaforo = asyncio.Semaphore(self.max_lotes)
+        # SIGTERM detiene el servidor de forma ordenada, igual que Ctrl+C.
+        with contextlib.suppress(NotImplementedError):
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGTERM, asyncio.current_task().cancel)
+        try:
+            for clave, tabla in self.tablas.items():
+                self._bloques[clave] = TablaCompartida.publicar_memoria_compartida(tabla)
+            nombres = {clave: bloque.name for clave, bloque in self._bloques.items()}
+            self._pool = ProcessPoolExecutor(
+                self.procesos, initializer=_iniciar_trabajador, initargs=(nombres,))
+
+            if ruta_unix:
+                servidor = await asyncio.start_unix_server(
+                    self._conexion, path=ruta_unix, limit=LIMITE_LINEA)
+            else:
+                servidor = await asyncio.start_server(
+                    self._conexion, host, puerto, limit=LIMITE_LINEA)
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+            for bloque in self._bloques.values():
+                TablaCompartida.destruir_bloque(bloque)
+            self._bloques = {}
+            if ruta_unix:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(ruta_unix)
+
+
+class ClienteAnalizador:
+    """
+    Cliente asyncio del servicio de análisis, con soporte para pipelining.
+
+    Varias llamadas concurrentes a `analizar` comparten la misma conexión;
+    cada respuesta se asocia a su solicitud mediante el campo "id".
+    """
+    def __init__(self):
+        """Inicializa un cliente desconectado."""
+        self._lector = None
+        self._escritor = None
+        self._esperando = {}
+        self._siguiente_id = 0
+        self._receptor = None
+
+    async def conectar(self, host=None, puerto=None, ruta_unix=None):
+        """Abre la conexión con el servidor (Unix si se indica `ruta_unix`, TCP si no)."""
+        if ruta_unix:
+            self._lector, self._escritor = await asyncio.open_unix_connection(
+                ruta_unix, limit=LIMITE_LINEA)
+        else:
+            self._lector, self._escritor = await asyncio.open_connection(
+                host, puerto, limit=LIMITE_LINEA)
+        self._receptor = asyncio.create_task(self._recibir())
+
+    async def _recibir(self):
+        """Lee respuestas y resuelve las solicitudes correspondientes."""
+        while True:
+            linea = await self._lector.readline()
+            if not linea:
+                break
+            respuesta = json.loads(linea)
+            futuro = self._esperando.pop(respuesta.get('id'), None)
+            if futuro is not None and not futuro.done():
+                futuro.set_result(respuesta)
+        for futuro in self._esperando.values():
+            futuro.set_exception(ConnectionError("El servidor cerró la conexión."))
+        self._esperando.clear()
+
+    async def analizar(self, gramatica, cadenas, analizador=None):
+        """
+        Envía un lote de cadenas y espera sus veredictos.
+
+        Args:
+            gramatica (str): El identificador de la gramática en el servidor.
+            cadenas (list[str]): Las cadenas a analizar.
+            analizador (str, opcional): 'll1' o 'slr1'.
+
+        Returns:
+            list[bool]: Los veredictos, en el orden de `cadenas`.
+
+        Raises:
+            RuntimeError: Si el servidor responde con un error.
+        """
+        self._siguiente_id += 1
+        id_solicitud = self._siguiente_id
+        solicitud = {'id': id_solicitud, 'gramatica': gramatica, 'cadenas': list(cadenas)}
+        if analizador:
+            solicitud['analizador'] = analizador
+
+        futuro = asyncio.get_running_loop().create_future()
+        self._esperando[id_solicitud] = futuro
+        self._escritor.write(json.dumps(solicitud).encode('utf-8') + b'\n')
+        await self._escritor.drain()
+
+        respuesta = await futuro
+        if 'error' in respuesta:
+            raise RuntimeError(respuesta['error'])
+        return respuesta['veredictos']
+
+    async def cerrar(self):
+        """Cierra la conexión con el servidor."""
+        self._escritor.close()
+        with contextlib.suppress(ConnectionError):
+            await self._escritor.wait_closed()
+        if self._receptor is not None:
+            await self._receptor
+
+
+async def generar_carga(direccion, gramatica, cadenas, conexiones=4, solicitudes=100,
+                        tamaño_lote=16, en_vuelo=8, analizador=None):
+    """
+    Genera carga contra un servidor y mide rendimiento y latencias.
+
+    Cada conexión envía `solicitudes` lotes de `tamaño_lote` cadenas tomadas
+    cíclicamente de `cadenas`, manteniendo hasta `en_vuelo` solicitudes
+    encadenadas sin respuesta.
+
+    Args:
+        direccion (dict): Argumentos de `ClienteAnalizador.conectar`.
+
+    Returns:
+        dict: Cadenas por segundo y latencias (p50, p99, máxima) en segundos.
+    """
+    latencias = []
+
+    async def conexion(numero):
+        cliente = ClienteAnalizador()
+        await cliente.conectar(**direccion)
+        limite = asyncio.Semaphore(en_vuelo)
+
+        async def una_solicitud(i):
+            inicio_lote = (numero * solicitudes + i) * tamaño_lote
+            lote = [cadenas[(inicio_lote + k) % len(cadenas)] for k in range(tamaño_lote)]
+            async with limite:
+                inicio = time.perf_counter()
+                await cliente.analizar(gramatica, lote, analizador)
+                latencias.append(time.perf_counter() - inicio)
+
+        await asyncio.gather(*(una_solicitud(i) for i in range(solicitudes)))
+        await cliente.cerrar()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(conexion(n) for n in range(conexiones)))
+    total = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        'cadenas_por_segundo': conexiones * solicitudes * tamaño_lote / total,
+        'latencia_p50': latencias[len(latencias) // 2],
+        'latencia_p99': latencias[min(len(latencias) - 1, int(len(latencias) * 0.99))],
+        'latencia_maxima': latencias[-1],
+    }
+
+
+def _direccion(argumentos):
+    """Traduce las opciones --tcp / --unix a argumentos de conexión."""
+    if argumentos.unix:
+        return {'ruta_unix': argumentos.unix}
+    host, _, puerto = argumentos.tcp.rpartition(':')
+    return {'host': host or '127.0.0.1', 'puerto': int(puerto)}
+
+
+def main():
+    """Punto de entrada de línea de comandos: servidor, cliente o generador de carga."""
+    parser = argparse.ArgumentParser(description="Servicio de análisis sintáctico LL(1)/SLR(1).")
+    subcomandos = parser.add_subparsers(dest='modo', required=True)
+
+    for nombre in ('servidor', 'cliente', 'carga'):
+        sub = subcomandos.add_parser(nombre)
+        destino = sub.add_mutually_exclusive_group(required=True)
+        destino.add_argument('--tcp', help="host:puerto")
+        destino.add_argument('--unix', help="ruta del socket Unix")
+        sub.add_argument('--analizador', choices=['ll1', 'slr1'])
+
+    servidor = subcomandos.choices['servidor']
+    servidor.add_argument('--gramatica', action='append', required=True, metavar='ID=RUTA')
+    servidor.add_argument('--procesos', type=int)
+    servidor.add_argument('--max-lotes', type=int)
+    servidor.add_argument('--max-pendientes', type=int, default=64)
+    servidor.add_argument('--umbral-en-linea', type=int, default=256)
+
+    cliente = subcomandos.choices['cliente']
+    cliente.add_argument('--gramatica', required=True)
+    cliente.add_argument('cadenas', nargs='*', help="si se omiten, se leen de la entrada estándar")
+
+    carga = subcomandos.choices['carga']
+    carga.add_argument('--gramatica', required=True)
+    carga.add_argument('--cadenas', required=True, help="archivo con una cadena por línea")
+    carga.add_argument('--conexiones', type=int, default=4)
+    carga.add_argument('--solicitudes', type=int, default=100)
+    carga.add_argument('--tamaño-lote', type=int, default=16)
+    carga.add_argument('--en-vuelo', type=int, default=8)
+
+    argumentos = parser.parse_args()
+    direccion = _direccion(argumentos)
+
+    if argumentos.modo == 'servidor':
+        servicio = ServidorAnalizador(argumentos.procesos, argumentos.max_lotes,
+                                      argumentos.max_pendientes, argumentos.umbral_en_linea)
+        for definicion in argumentos.gramatica:
+            id_gramatica, _, ruta = definicion.partition('=')
+            tipos = servicio.cargar_gramatica(id_gramatica, ruta)
+            print(f"Gramática {id_gramatica}: {', '.join(tipos) or 'sin analizadores compatibles'}")
+        print("Servidor escuchando...")
+        with contextlib.suppress(KeyboardInterrupt, asyncio.CancelledError):
+            asyncio.run(servicio.iniciar(ruta_unix=direccion.get('ruta_unix'),
+                                         host=direccion.get('host'),
+                                         puerto=direccion.get('puerto')))
+
+    elif argumentos.modo == 'cliente':
+        cadenas = argumentos.cadenas or [linea.strip() for linea in sys.stdin]
+
+        async def consultar():
+            cliente = ClienteAnalizador()
+            await cliente.conectar(**direccion)
+            veredictos = await cliente.analizar(argumentos.gramatica, cadenas, argumentos.analizador)
+            await cliente.cerrar()
+            return veredictos
+
+        try:
+            veredictos = asyncio.run(consultar())
+        except RuntimeError as error:
+            print("Error:", error)
+            return
+        for cadena, veredicto in zip(cadenas, veredictos):
+            print(f"{cadena}: {'si' if veredicto else 'no'}")
+
+    else:
+        with open(argumentos.cadenas, encoding='utf-8') as archivo:
+            cadenas = [linea.rstrip('\n') for linea in archivo]
+        resultado = asyncio.run(generar_carga(
+            direccion, argumentos.gramatica, cadenas, argumentos.conexiones,
+            argumentos.solicitudes, argumentos.tamaño_lote, argumentos.en_vuelo,
+            argumentos.analizador))
+        print(f"Cadenas por segundo: {resultado['cadenas_por_segundo']:.1f}")
+        print(f"Latencia p50: {resultado['latencia_p50'] * 1000:.2f} ms")
+        print(f"Latencia p99: {resultado['latencia_p99'] * 1000:.2f} ms")
+        print(f"Latencia máxima: {resultado['latencia_maxima'] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
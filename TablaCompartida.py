@@ -0,0 +1,260 @@
+"""
+Publicación de Tablas de Análisis en Memoria Compartida
+
+Este módulo define un formato binario independiente de la posición para las
+tablas de `TablaComprimida` (SLR(1) y LL(1)), de modo que puedan publicarse una
+sola vez en `multiprocessing.shared_memory` o en un archivo mapeado en memoria.
+Cada proceso trabajador se adjunta al buffer y analiza directamente sobre él,
+sin copias ni deserialización de las tablas.
+
+Formato del buffer (todos los desplazamientos son relativos al inicio):
+- 4 bytes: la firma b'LFTB'.
+- 4 bytes: versión del formato (entero sin signo, little-endian).
+- 4 bytes: longitud L de la cabecera.
+- L bytes: cabecera JSON con el tipo de tabla, sus metadatos y, para cada
+  sección, su desplazamiento, su código de tipo (`array`) y su longitud.
+- Las secciones, alineadas a 8 bytes.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+from TablaComprimida import TablaComprimida, TablaLL1Compacta
+
+FIRMA = b'LFTB'
+VERSION = 1
+_PREAMBULO = struct.Struct('<4sII')
+_ALINEACION = 8
+
+_TIPOS = {clase.tipo: clase for clase in (TablaComprimida, TablaLL1Compacta)}
+
+
+def _alinear(posicion):
+    """Redondea una posición al siguiente múltiplo de la alineación."""
+    return (posicion + _ALINEACION - 1) // _ALINEACION * _ALINEACION
+
+
+def serializar(tabla):
+    """
+    Convierte una tabla comprimida en su representación binaria.
+
+    Args:
+        tabla: Una `TablaComprimida` o `TablaLL1Compacta`.
+
+    Returns:
+        bytes: El buffer completo, listo para copiarse a memoria compartida o a disco.
+    """
+    secciones = tabla.secciones()
+
+    # Las posiciones de las secciones dependen del tamaño de la cabecera, que a su
+    # vez las contiene; se reserva espacio hasta que ambas cosas sean coherentes.
+    reserva = 0
+    while True:
+        posicion = _alinear(_PREAMBULO.size + reserva)
+        indice = {}
+        for nombre, buffer in secciones.items():
+            indice[nombre] = [posicion, buffer.typecode, len(buffer)]
+            posicion = _alinear(posicion + buffer.itemsize * len(buffer))
+        cabecera = json.dumps({
+            'tipo': tabla.tipo,
+            'metadatos': tabla.metadatos(),
+            'secciones': indice,
+        }).encode('utf-8')
+        if len(cabecera) <= reserva:
+            break
+        reserva = len(cabecera)
+
+    datos = bytearray(posicion)
+    _PREAMBULO.pack_into(datos, 0, FIRMA, VERSION, len(cabecera))
+    datos[_PREAMBULO.size:_PREAMBULO.size + len(cabecera)] = cabecera
+    for nombre, buffer in secciones.items():
+        inicio = indice[nombre][0]
+        crudo = memoryview(buffer).cast('B')
+        datos[inicio:inicio + len(crudo)] = crudo
+    return bytes(datos)
+
+
+def desde_buffer(buffer):
+    """
+    Reconstruye una tabla sobre un buffer existente, sin copiar sus secciones.
+
+    Args:
+        buffer: Cualquier objeto que soporte el protocolo de buffer (bytes,
+            `SharedMemory.buf`, `mmap`...).
+
+    Returns:
+        Una `TablaComprimida` o `TablaLL1Compacta` cuyas secciones son
+        `memoryview` sobre el buffer.
+
+    Raises:
+        ValueError: Si el buffer no tiene el formato esperado.
+    """
+    vista = memoryview(buffer)
+    firma, version, longitud = _PREAMBULO.unpack_from(vista, 0)
+    if firma != FIRMA or version != VERSION:
+        raise ValueError("El buffer no contiene una tabla de análisis compatible.")
+
+    cabecera = json.loads(bytes(vista[_PREAMBULO.size:_PREAMBULO.size + longitud]))
+    secciones = {}
+    for nombre, (inicio, codigo, cantidad) in cabecera['secciones'].items():
+        tamaño = struct.calcsize(codigo) * cantidad
+        secciones[nombre] = vista[inicio:inicio + tamaño].cast(codigo)
+    return _TIPOS[cabecera['tipo']].desde_secciones(cabecera['metadatos'], secciones)
+
+
+def _retirar_del_rastreador(bloque):
+    """
+    Retira un bloque del resource_tracker (antes de Python 3.13).
+
+    Todo proceso que crea o se adjunta a un bloque lo registra en su
+    resource_tracker, que lo destruye cuando el proceso termina. Un trabajador
+    cualquiera, o un hijo suyo que se adjunte, destruiría así la tabla de todos
+    los demás. Estos bloques tienen un dueño que los destruye explícitamente
+    (ver `destruir_bloque`), así que nadie los deja registrados.
+    """
+    if os.name == 'posix':
+        # `name` omite la '/' inicial con la que el bloque se registró.
+        resource_tracker.unregister('/' + bloque.name, 'shared_memory')
+
+
+def crear_bloque(tamaño, nombre=None):
+    """
+    Crea un bloque de memoria compartida sin que lo vigile el resource_tracker.
+
+    Args:
+        tamaño (int): El tamaño del bloque en bytes.
+        nombre (str, opcional): El nombre del bloque. Si se omite, se genera uno.
+
+    Returns:
+        SharedMemory: El bloque; quien lo crea debe destruirlo con `destruir_bloque`.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=nombre, create=True, size=tamaño, track=False)
+    bloque = shared_memory.SharedMemory(name=nombre, create=True, size=tamaño)
+    _retirar_del_rastreador(bloque)
+    return bloque
+
+
+def destruir_bloque(bloque):
+    """
+    Cierra y destruye un bloque creado con `crear_bloque`.
+
+    Args:
+        bloque (SharedMemory): El bloque a destruir.
+    """
+    bloque.close()
+    if sys.version_info < (3, 13) and os.name == 'posix':
+        # Antes de Python 3.13, `unlink()` retira el bloque del resource_tracker
+        # aunque ya no esté registrado; se registra de nuevo para equilibrarlo.
+        resource_tracker.register('/' + bloque.name, 'shared_memory')
+    bloque.unlink()
+
+
+def publicar_memoria_compartida(tabla, nombre=None):
+    """
+    Publica una tabla en un bloque nuevo de memoria compartida.
+
+    El proceso que publica es el dueño del bloque: debe mantener el objeto
+    devuelto mientras haya trabajadores adjuntos y, al terminar, destruirlo con
+    `destruir_bloque`. Si termina sin hacerlo, el bloque no se destruye solo.
+
+    Args:
+        tabla: Una `TablaComprimida` o `TablaLL1Compacta`.
+        nombre (str, opcional): El nombre del bloque. Si se omite, se genera uno.
+
+    Returns:
+        SharedMemory: El bloque creado; su nombre está en `.name`.
+    """
+    datos = serializar(tabla)
+    bloque = crear_bloque(len(datos), nombre)
+    bloque.buf[:len(datos)] = datos
+    return bloque
+
+
+def adjuntar_bloque(nombre):
+    """
+    Se adjunta a un bloque de memoria compartida publicado por otro proceso.
+
+    Args:
+        nombre (str): El nombre del bloque.
+
+    Returns:
+        SharedMemory: El bloque; debe cerrarse con `close()`, pero no destruirse.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=nombre, track=False)
+    bloque = shared_memory.SharedMemory(name=nombre)
+    _retirar_del_rastreador(bloque)
+    return bloque
+
+
+def adjuntar_memoria_compartida(nombre):
+    """
+    Se adjunta a una tabla publicada con `publicar_memoria_compartida`.
+
+    Args:
+        nombre (str): El nombre del bloque de memoria compartida.
+
+    Returns:
+        La tabla, analizando directamente sobre la memoria compartida.
+        Debe liberarse con `liberar` cuando ya no se use.
+    """
+    bloque = adjuntar_bloque(nombre)
+    tabla = desde_buffer(bloque.buf)
+    tabla._origen = bloque
+    return tabla
+
+
+def publicar_archivo(tabla, ruta):
+    """
+    Escribe una tabla en un archivo, para luego mapearlo con `adjuntar_archivo`.
+
+    Args:
+        tabla: Una `TablaComprimida` o `TablaLL1Compacta`.
+        ruta (str): La ruta del archivo a escribir.
+    """
+    with open(ruta, 'wb') as archivo:
+        archivo.write(serializar(tabla))
+
+
+def adjuntar_archivo(ruta):
+    """
+    Mapea en memoria (solo lectura) un archivo escrito con `publicar_archivo`.
+
+    Todos los procesos que mapean el mismo archivo comparten sus páginas.
+
+    Args:
+        ruta (str): La ruta del archivo.
+
+    Returns:
+        La tabla, analizando directamente sobre el archivo mapeado.
+        Debe liberarse con `liberar` cuando ya no se use.
+    """
+    with open(ruta, 'rb') as archivo:
+        mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+    tabla = desde_buffer(mapa)
+    tabla._origen = mapa
+    return tabla
+
+
+def liberar(tabla):
+    """
+    Suelta las vistas de una tabla adjunta y cierra el buffer subyacente.
+
+    Tras llamar a esta función la tabla ya no puede usarse. No destruye el
+    bloque de memoria compartida; eso le corresponde a quien lo publicó.
+
+    Args:
+        tabla: Una tabla devuelta por `adjuntar_memoria_compartida` o `adjuntar_archivo`.
+    """
+    for buffer in tabla.secciones().values():
+        if isinstance(buffer, memoryview):
+            buffer.release()
+    origen = getattr(tabla, '_origen', None)
+    if origen is not None:
+        origen.close()
+        tabla._origen = None
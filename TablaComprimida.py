@@ -0,0 +1,517 @@
+"""
+Tablas de Análisis Comprimidas
+
+Este módulo transforma las tablas ACCION e IR_A de un `AnalizadorSLR1` (que se
+guardan como diccionarios con una entrada por cada par (estado, símbolo)) en
+un formato empaquetado sobre buffers `array`, y ofrece un driver que analiza
+cadenas directamente sobre ese formato. También incluye una versión compacta
+de la tabla LL(1), con la misma interfaz.
+
+Todas las tablas se describen como un conjunto de secciones (buffers de enteros)
+más unos metadatos pequeños, lo que permite publicarlas en memoria compartida
+(ver `TablaCompartida`) y analizar directamente sobre esa memoria.
+
+Técnicas de compresión aplicadas:
+- Reducciones por defecto: cada estado guarda su reducción más frecuente y esas
+  entradas se eliminan de la fila. Los estados consistentes (que solo reducen
+  por una producción) reducen sin consultar el símbolo de entrada.
+- Compartición de filas: los estados con filas idénticas comparten una sola fila.
+- Desplazamiento de filas (comb-vector): las filas se superponen en un único
+  vector de valores, usando un vector de control para detectar colisiones.
+
+Codificación de las acciones (enteros con signo):
+- 0: error.
+- -1: aceptar.
+- j + 1 (positivo): desplazar al estado j.
+- -(p + 2) (menor que -1): reducir por la producción p.
+"""
+
+from array import array
+from collections import Counter
+
+ERROR = 0
+ACEPTAR = -1
+
+
+def _empaquetar(filas, ancho):
+    """
+    Empaqueta un conjunto de filas dispersas mediante desplazamiento de filas.
+
+    Cada fila se coloca en un vector común a partir de una base, buscando la
+    primera base en la que ninguna de sus columnas ocupadas choque con otra fila.
+    Las filas más densas se colocan primero, ya que son las más difíciles de encajar.
+
+    Args:
+        filas (list[dict]): Para cada fila, un diccionario columna -> valor.
+        ancho (int): Número de columnas posibles.
+
+    Returns:
+        tuple: Los arrays (base, control, valor). `control[i]` contiene el número
+        de fila dueña de la posición i, o -1 si está libre.
+    """
+    base = array('i', [0] * len(filas))
+    control = array('i', [-1] * ancho)
+    valor = array('i', [ERROR] * ancho)
+
+    # Todas las posiciones anteriores a `libre` están ocupadas.
+    libre = 0
+    orden = sorted(range(len(filas)), key=lambda f: len(filas[f]), reverse=True)
+    for numero_fila in orden:
+        fila = filas[numero_fila]
+        if not fila:
+            continue
+        columnas = sorted(fila)
+        desplazamiento = max(0, libre - columnas[0])
+        while True:
+            # Extiende los vectores si la fila no cabe en el espacio actual.
+            limite = desplazamiento + ancho
+            if limite > len(control):
+                control.extend([-1] * (limite - len(control)))
+                valor.extend([ERROR] * (limite - len(valor)))
+            if all(control[desplazamiento + c] == -1 for c in columnas):
+                break
+            desplazamiento += 1
+
+        base[numero_fila] = desplazamiento
+        for c in columnas:
+            control[desplazamiento + c] = numero_fila
+            valor[desplazamiento + c] = fila[c]
+        while libre < len(control) and control[libre] != -1:
+            libre += 1
+
+    return base, control, valor
+
+
+class TablaComprimida:
+    """
+    Representación empaquetada de las tablas ACCION e IR_A de un analizador SLR(1).
+
+    Atributos:
+        terminales (list[str]): Los terminales, indexados por su id numérico.
+        no_terminales (list[str]): Los no terminales, indexados por su id numérico.
+        id_terminal (dict): Mapeo de terminal a su id numérico.
+        id_no_terminal (dict): Mapeo de no terminal a su id numérico.
+        producciones (list): Las producciones (no_terminal, produccion) indexadas por id.
+        lado_izquierdo (array): Id del no terminal de cada producción.
+        longitud (array): Número de símbolos a desapilar al reducir cada producción.
+        fila_estado (array): Fila (compartida) asignada a cada estado.
+        por_defecto (array): Acción por defecto de cada estado.
+        consistente (array): 1 si el estado reduce sin consultar la entrada.
+        base, control, valor (array): Vectores empaquetados de la tabla ACCION.
+        base_ir_a, control_ir_a, valor_ir_a (array): Vectores empaquetados de IR_A.
+        ir_a_por_defecto (array): Destino más frecuente de IR_A para cada no terminal.
+        es_slr1 (bool): Copia de la compatibilidad del analizador original.
+    """
+    tipo = 'slr1'
+    _SECCIONES = ('lado_izquierdo', 'longitud', 'fila_estado', 'por_defecto', 'consistente',
+                  'base', 'control', 'valor',
+                  'base_ir_a', 'control_ir_a', 'valor_ir_a', 'ir_a_por_defecto')
+
+    def __init__(self, analizador):
+        """
+        Construye la tabla comprimida a partir de un `AnalizadorSLR1`.
+
+        Args:
+            analizador: Un `AnalizadorSLR1` cuyas tablas ya fueron construidas.
+        """
+        gramatica = analizador.gramatica
+        self.es_slr1 = analizador.es_slr1
+        self.numero_estados = len(analizador.estados)
+
+        self.terminales = sorted(gramatica.terminales)
+        self.no_terminales = sorted(gramatica.no_terminales)
+        self.id_terminal = {t: i for i, t in enumerate(self.terminales)}
+        self.id_no_terminal = {nt: i for i, nt in enumerate(self.no_terminales)}
+
+        self.producciones = []
+        self.lado_izquierdo = array('i')
+        self.longitud = array('i')
+        self._construir_accion(analizador.accion)
+        self._construir_ir_a(analizador.ir_a)
+
+    @classmethod
+    def desde_secciones(cls, metadatos, secciones):
+        """
+        Reconstruye la tabla a partir de sus metadatos y secciones, sin copiarlas.
+
+        Las secciones pueden ser `array` o `memoryview` (por ejemplo, sobre un
+        bloque de memoria compartida); el driver solo necesita indexarlas.
+
+        Args:
+            metadatos (dict): El resultado de `metadatos()`.
+            secciones (dict): Mapeo de nombre de sección a buffer indexable.
+
+        Returns:
+            TablaComprimida: La tabla reconstruida.
+        """
+        tabla = cls.__new__(cls)
+        tabla.es_slr1 = metadatos['es_slr1']
+        tabla.numero_estados = metadatos['numero_estados']
+        tabla.numero_filas = metadatos['numero_filas']
+        tabla.terminales = metadatos['terminales']
+        tabla.no_terminales = metadatos['no_terminales']
+        tabla.id_terminal = {t: i for i, t in enumerate(tabla.terminales)}
+        tabla.id_no_terminal = {nt: i for i, nt in enumerate(tabla.no_terminales)}
+        tabla.producciones = [(nt, list(prod)) for nt, prod in metadatos['producciones']]
+        for nombre in cls._SECCIONES:
+            setattr(tabla, nombre, secciones[nombre])
+        return tabla
+
+    def metadatos(self):
+        """Devuelve los datos no tabulares de la tabla, serializables como JSON."""
+        return {
+            'es_slr1': self.es_slr1,
+            'numero_estados': self.numero_estados,
+            'numero_filas': self.numero_filas,
+            'terminales': self.terminales,
+            'no_terminales': self.no_terminales,
+            'producciones': self.producciones,
+        }
+
+    def secciones(self):
+        """Devuelve los buffers de la tabla, en un orden fijo."""
+        return {nombre: getattr(self, nombre) for nombre in self._SECCIONES}
+
+    def _id_produccion(self, ids_produccion, no_terminal, produccion):
+        """Devuelve el id de una producción, registrándola si es nueva."""
+        clave = (no_terminal, tuple(produccion))
+        if clave not in ids_produccion:
+            ids_produccion[clave] = len(self.producciones)
+            self.producciones.append((no_terminal, produccion))
+            self.lado_izquierdo.append(self.id_no_terminal[no_terminal])
+            self.longitud.append(0 if produccion == ['e'] else len(produccion))
+        return ids_produccion[clave]
+
+    def _construir_accion(self, accion):
+        """Codifica, deduplica y empaqueta la tabla ACCION."""
+        ids_produccion = {}
+        filas_estado = [{} for _ in range(self.numero_estados)]
+
+        for (estado, terminal), entrada in accion.items():
+            if entrada == 'aceptar':
+                codigo = ACEPTAR
+            elif entrada[0] == 'desplazar':
+                codigo = entrada[1] + 1
+            else:
+                p = self._id_produccion(ids_produccion, entrada[1], entrada[2])
+                codigo = -(p + 2)
+            filas_estado[estado][self.id_terminal[terminal]] = codigo
+
+        self.por_defecto = array('i', [ERROR] * self.numero_estados)
+        self.consistente = array('b', [0] * self.numero_estados)
+        self.fila_estado = array('i', [0] * self.numero_estados)
+        filas_unicas = []
+        id_fila = {}
+
+        for estado, fila in enumerate(filas_estado):
+            # La reducción más frecuente del estado se convierte en su acción por defecto.
+            reducciones = Counter(c for c in fila.values() if c < ACEPTAR)
+            if reducciones:
+                defecto = reducciones.most_common(1)[0][0]
+                self.por_defecto[estado] = defecto
+                fila = {t: c for t, c in fila.items() if c != defecto}
+                if not fila:
+                    self.consistente[estado] = 1
+
+            clave = tuple(sorted(fila.items()))
+            if clave not in id_fila:
+                id_fila[clave] = len(filas_unicas)
+                filas_unicas.append(fila)
+            self.fila_estado[estado] = id_fila[clave]
+
+        self.numero_filas = len(filas_unicas)
+        self.base, self.control, self.valor = _empaquetar(filas_unicas, len(self.terminales))
+
+    def _construir_ir_a(self, ir_a):
+        """Empaqueta la tabla IR_A por columnas, con un destino por defecto por no terminal."""
+        columnas = [{} for _ in self.no_terminales]
+        for (estado, no_terminal), destino in ir_a.items():
+            columnas[self.id_no_terminal[no_terminal]][estado] = destino
+
+        # Durante un análisis válido IR_A siempre está definido, por lo que el
+        # destino más frecuente puede servir de valor por defecto sin riesgo.
+        self.ir_a_por_defecto = array('i', [0] * len(columnas))
+        for a, columna in enumerate(columnas):
+            if columna:
+                defecto = Counter(columna.values()).most_common(1)[0][0]
+                self.ir_a_por_defecto[a] = defecto
+                columnas[a] = {e: d for e, d in columna.items() if d != defecto}
+
+        self.base_ir_a, self.control_ir_a, self.valor_ir_a = _empaquetar(columnas, self.numero_estados)
+
+    def accion(self, estado, terminal):
+        """
+        Consulta la tabla ACCION empaquetada.
+
+        Args:
+            estado (int): El estado en el tope de la pila.
+            terminal (int): El id del terminal actual.
+
+        Returns:
+            int: El código de la acción (ver la codificación del módulo).
+        """
+        fila = self.fila_estado[estado]
+        i = self.base[fila] + terminal
+        if self.control[i] == fila:
+            return self.valor[i]
+        return self.por_defecto[estado]
+
+    def ir_a(self, estado, no_terminal):
+        """
+        Consulta la tabla IR_A empaquetada.
+
+        Args:
+            estado (int): El estado descubierto tras desapilar.
+            no_terminal (int): El id del no terminal reducido.
+
+        Returns:
+            int: El estado destino.
+        """
+        i = self.base_ir_a[no_terminal] + estado
+        if self.control_ir_a[i] == no_terminal:
+            return self.valor_ir_a[i]
+        return self.ir_a_por_defecto[no_terminal]
+
+    def analizar(self, cadena_entrada):
+        """
+        Analiza una cadena de entrada directamente sobre las tablas empaquetadas.
+
+        Sigue el mismo algoritmo que `AnalizadorSLR1.analizar`, pero los estados
+        consistentes reducen sin leer el símbolo actual y las búsquedas se hacen
+        sobre los vectores empaquetados.
+
+        Args:
+            cadena_entrada (str): La cadena a analizar.
+
+        Returns:
+            bool: True si la cadena es aceptada, False si no.
+        """
+        if not self.es_slr1:
+            return False
+
+        id_terminal = self.id_terminal
+        fin = id_terminal['$']
+        fila_estado, base, control, valor = self.fila_estado, self.base, self.control, self.valor
+        por_defecto, consistente = self.por_defecto, self.consistente
+        longitud, lado_izquierdo = self.longitud, self.lado_izquierdo
+
+        pila = [0]
+        indice_entrada = 0
+        n = len(cadena_entrada)
+
+        while True:
+            estado = pila[-1]
+
+            if consistente[estado]:
+                codigo = por_defecto[estado]
+            else:
+                if indice_entrada < n:
+                    terminal = id_terminal.get(cadena_entrada[indice_entrada], -1)
+                    if terminal < 0:
+                        return False  # Error: símbolo fuera del alfabeto.
+                else:
+                    terminal = fin
+                fila = fila_estado[estado]
+                i = base[fila] + terminal
+                codigo = valor[i] if control[i] == fila else por_defecto[estado]
+
+            if codigo > 0:
+                pila.append(codigo - 1)
+                indice_entrada += 1
+
+            elif codigo < ACEPTAR:
+                p = -codigo - 2
+                if longitud[p]:
+                    del pila[-longitud[p]:]
+                pila.append(self.ir_a(pila[-1], lado_izquierdo[p]))
+
+            elif codigo == ACEPTAR:
+                return True
+
+            else:
+                return False  # Error: acción no definida.
+
+    def estadisticas(self):
+        """
+        Calcula el tamaño de la tabla comprimida frente a una tabla densa.
+
+        La tabla densa de referencia usa un entero de 4 bytes por cada celda
+        (estado, símbolo) de ACCION e IR_A.
+
+        Returns:
+            dict: Estados, filas únicas, celdas y bytes de ambas representaciones,
+            y la razón de compresión (bytes densos / bytes comprimidos).
+        """
+        buffers = self.secciones().values()
+        celdas_densas = self.numero_estados * (len(self.terminales) + len(self.no_terminales))
+        bytes_densos = celdas_densas * 4
+        bytes_comprimidos = sum(b.itemsize * len(b) for b in buffers)
+        return {
+            'estados': self.numero_estados,
+            'filas_unicas': self.numero_filas,
+            'estados_consistentes': sum(self.consistente),
+            'celdas_densas': celdas_densas,
+            'celdas_comprimidas': len(self.valor) + len(self.valor_ir_a),
+            'bytes_densos': bytes_densos,
+            'bytes_comprimidos': bytes_comprimidos,
+            'razon_compresion': bytes_densos / bytes_comprimidos if bytes_comprimidos else 0.0,
+        }
+
+    def imprimir_estadisticas(self):
+        """Imprime las estadísticas de compresión de forma legible."""
+        datos = self.estadisticas()
+        print("\n=== Tabla SLR(1) Comprimida ===")
+        print(f"Estados: {datos['estados']} (filas únicas: {datos['filas_unicas']}, "
+              f"consistentes: {datos['estados_consistentes']})")
+        print(f"Celdas: {datos['celdas_densas']} densas -> {datos['celdas_comprimidas']} empaquetadas")
+        print(f"Memoria: {datos['bytes_densos']} bytes -> {datos['bytes_comprimidos']} bytes "
+              f"(razón {datos['razon_compresion']:.2f}x)")
+
+
+class TablaLL1Compacta:
+    """
+    Representación compacta de la tabla de análisis LL(1).
+
+    La tabla M[A, a] se guarda como una matriz densa de ids de producción, y los
+    lados derechos de las producciones se guardan ya invertidos en un único
+    vector, listos para apilarse.
+
+    Codificación de los símbolos: los terminales ocupan los ids 0..T-1 y los no
+    terminales los ids T..T+N-1. Los símbolos que no son ni terminales ni no
+    terminales se codifican como -1 y provocan el rechazo, igual que en
+    `AnalizadorLL1.analizar`.
+
+    Atributos:
+        terminales (list[str]): Los terminales, indexados por su id numérico.
+        no_terminales (list[str]): Los no terminales, indexados por su id menos T.
+        tabla (array): Matriz N x T; cada celda es el id de producción + 1, o 0 si está vacía.
+        inicio_produccion (array): Posición de cada producción en `simbolos_produccion`
+            (con una posición final adicional).
+        simbolos_produccion (array): Los lados derechos invertidos, concatenados.
+        simbolo_inicial (int): El id del símbolo inicial.
+        es_ll1 (bool): Copia de la compatibilidad del analizador original.
+    """
+    tipo = 'll1'
+    _SECCIONES = ('tabla', 'inicio_produccion', 'simbolos_produccion')
+
+    def __init__(self, analizador):
+        """
+        Construye la tabla compacta a partir de un `AnalizadorLL1`.
+
+        Args:
+            analizador: Un `AnalizadorLL1` cuya tabla ya fue construida.
+        """
+        gramatica = analizador.gramatica
+        self.es_ll1 = analizador.es_ll1
+        self.terminales = sorted(gramatica.terminales)
+        self.no_terminales = sorted(gramatica.no_terminales)
+        self._indexar_simbolos()
+        self.simbolo_inicial = self.id_simbolo.get(gramatica.simbolo_inicial, -1)
+
+        ids_produccion = {}
+        self.inicio_produccion = array('i', [0])
+        self.simbolos_produccion = array('i')
+        self.tabla = array('i', [0] * (len(self.no_terminales) * len(self.terminales)))
+
+        for (nt, terminal), produccion in analizador.tabla_analisis.items():
+            clave = (nt, tuple(produccion))
+            if clave not in ids_produccion:
+                ids_produccion[clave] = len(ids_produccion)
+                if produccion != ['e']:
+                    self.simbolos_produccion.extend(
+                        self.id_simbolo.get(simbolo, -1) for simbolo in reversed(produccion))
+                self.inicio_produccion.append(len(self.simbolos_produccion))
+            celda = self.id_simbolo[nt] - len(self.terminales)
+            celda = celda * len(self.terminales) + self.id_simbolo[terminal]
+            self.tabla[celda] = ids_produccion[clave] + 1
+
+    def _indexar_simbolos(self):
+        """Asigna ids numéricos a terminales y no terminales."""
+        self.id_simbolo = {t: i for i, t in enumerate(self.terminales)}
+        for i, nt in enumerate(self.no_terminales):
+            self.id_simbolo[nt] = len(self.terminales) + i
+
+    @classmethod
+    def desde_secciones(cls, metadatos, secciones):
+        """
+        Reconstruye la tabla a partir de sus metadatos y secciones, sin copiarlas.
+
+        Args:
+            metadatos (dict): El resultado de `metadatos()`.
+            secciones (dict): Mapeo de nombre de sección a buffer indexable.
+
+        Returns:
+            TablaLL1Compacta: La tabla reconstruida.
+        """
+        tabla = cls.__new__(cls)
+        tabla.es_ll1 = metadatos['es_ll1']
+        tabla.terminales = metadatos['terminales']
+        tabla.no_terminales = metadatos['no_terminales']
+        tabla.simbolo_inicial = metadatos['simbolo_inicial']
+        tabla._indexar_simbolos()
+        for nombre in cls._SECCIONES:
+            setattr(tabla, nombre, secciones[nombre])
+        return tabla
+
+    def metadatos(self):
+        """Devuelve los datos no tabulares de la tabla, serializables como JSON."""
+        return {
+            'es_ll1': self.es_ll1,
+            'terminales': self.terminales,
+            'no_terminales': self.no_terminales,
+            'simbolo_inicial': self.simbolo_inicial,
+        }
+
+    def secciones(self):
+        """Devuelve los buffers de la tabla, en un orden fijo."""
+        return {nombre: getattr(self, nombre) for nombre in self._SECCIONES}
+
+    def analizar(self, cadena_entrada):
+        """
+        Analiza una cadena de entrada sobre la tabla compacta.
+
+        Sigue el mismo algoritmo que `AnalizadorLL1.analizar`, trabajando con
+        ids numéricos en lugar de cadenas.
+
+        Args:
+            cadena_entrada (str): La cadena a analizar.
+
+        Returns:
+            bool: True si la cadena es aceptada, False en caso contrario.
+        """
+        if not self.es_ll1 or self.simbolo_inicial < 0:
+            return False
+
+        id_simbolo = self.id_simbolo
+        numero_terminales = len(self.terminales)
+        tabla, inicio, simbolos = self.tabla, self.inicio_produccion, self.simbolos_produccion
+
+        cadena_entrada += '$'
+        pila = [id_simbolo['$'], self.simbolo_inicial]
+        indice_entrada = 0
+
+        while pila:
+            tope = pila[-1]
+            entrada_actual = id_simbolo.get(cadena_entrada[indice_entrada], -1)
+            if entrada_actual >= numero_terminales:
+                entrada_actual = -1  # Un no terminal en la entrada nunca coincide.
+
+            if 0 <= tope < numero_terminales:
+                if tope == entrada_actual:
+                    pila.pop()
+                    indice_entrada += 1
+                else:
+                    return False  # Error: terminal no coincide.
+
+            elif tope >= numero_terminales:
+                if entrada_actual < 0:
+                    return False  # Error: no hay producción en la tabla.
+                p = tabla[(tope - numero_terminales) * numero_terminales + entrada_actual]
+                if not p:
+                    return False  # Error: no hay producción en la tabla.
+                pila.pop()
+                pila.extend(simbolos[inicio[p - 1]:inicio[p]])
+            else:
+                return False  # Símbolo inesperado en la pila.
+
+        return indice_entrada == len(cadena_entrada)
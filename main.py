@@ -9,16 +9,33 @@ Este script es el orquestador principal del proyecto. Su función es:
    de analizador.
 4. Permitir al usuario analizar cadenas de entrada utilizando el analizador
    o analizadores compatibles.
+
+Modos de arranque (sin opciones se construyen ambos analizadores, uno tras otro):
+    python main.py --analizador ll1     Construye solo el analizador LL(1).
+    python main.py --analizador slr1    Construye solo el analizador SLR(1).
+    python main.py --paralelo           Construye ambos en procesos separados y
+                                        analiza con el primero que esté listo.
+
+Los módulos de los analizadores se importan solo cuando se necesitan. En todos
+los modos se informa, por la salida de error, del tiempo transcurrido desde el
+arranque hasta el primer veredicto.
 """
 
+import argparse
+import sys
 import time  # Se mantiene la importación
 
+_INICIO = time.perf_counter()
+
 from Gramatica import Gramatica
-from First_Follow import First_Follow
-from AnalizadorLL1 import AnalizadorLL1
-from AnalizadorSLR1 import AnalizadorSLR1
 
-def main():
+# Segundos desde el arranque hasta el primer veredicto, una vez emitido.
+_primer_veredicto = None
+
+NOMBRES = {'ll1': 'LL(1)', 'slr1': 'SLR(1)'}
+
+
+def main(argv=None):
     """
     Función principal que coordina todo el proceso de análisis.
 
@@ -27,65 +44,50 @@ def main():
     2. Cálculo de conjuntos FIRST y FOLLOW.
     3. Construcción de ambos analizadores.
     4. Interacción con el usuario para el análisis de cadenas.
+
+    Con `--analizador` solo se construye el indicado, y con `--paralelo` las
+    fases 2 y 3 se hacen en segundo plano (ver `main_paralelo`).
+
+    Args:
+        argv (list[str], opcional): Los argumentos; por defecto, los de la línea de comandos.
     """
-    
+    argumentos = parsear_argumentos(argv)
+
     # Fase 1: Leer y parsear la gramática proporcionada por el usuario.
     # --- MEDICIÓN ELIMINADA DE ESTA SECCIÓN ---
     print("Por favor, introduce la gramática:")
     gramatica = Gramatica()
     gramatica.parsear_entrada()
-    
+
     print("\nGramática parseada:")
     print(gramatica)
 
+    if argumentos.paralelo:
+        main_paralelo(gramatica)
+        return
+    if argumentos.analizador != 'ambos':
+        main_selectivo(gramatica, argumentos.analizador)
+        return
+
     # --- INICIO DE MEDICIONES ---
 
     # Fase 2: Calcular los conjuntos FIRST y FOLLOW
-    first_follow = First_Follow(gramatica)
-    
-    # Medición de FIRST
-    start_time_first = time.perf_counter()
-    first_follow.calcular_first()
-    end_time_first = time.perf_counter()
-    print(f"\nCálculo de FIRST (en {end_time_first - start_time_first:.6f} segundos)")
-
-    # Medición de FOLLOW
-    start_time_follow = time.perf_counter()
-    first_follow.calcular_follow()
-    end_time_follow = time.perf_counter()
-    print(f"Cálculo de FOLLOW (en {end_time_follow - start_time_follow:.6f} segundos)")
+    first_follow = calcular_first_follow(gramatica)
 
     # Fase 3: Construir el analizador LL(1)
-    analizador_ll1 = AnalizadorLL1(gramatica, first_follow)
-    
-    # Medición de tabla LL(1)
-    start_time_ll1 = time.perf_counter()
-    es_ll1 = analizador_ll1.construir_tabla_analisis()
-    end_time_ll1 = time.perf_counter()
-    print(f"\nConstrucción de tabla LL(1) (en {end_time_ll1 - start_time_ll1:.6f} segundos)")
+    analizador_ll1, es_ll1, segundos = construir_analizador('ll1', gramatica, first_follow)
+    print(f"\nConstrucción de tabla LL(1) (en {segundos:.6f} segundos)")
 
     # Fase 4: Construir el analizador SLR(1)
-    analizador_slr1 = AnalizadorSLR1(gramatica, first_follow)
-    
-    # Medición de tabla SLR(1)
-    start_time_slr1 = time.perf_counter()
-    es_slr1 = analizador_slr1.construir_tabla_analisis()
-    end_time_slr1 = time.perf_counter()
-    print(f"Construcción de tabla SLR(1) (en {end_time_slr1 - start_time_slr1:.6f} segundos)")
+    analizador_slr1, es_slr1, segundos = construir_analizador('slr1', gramatica, first_follow)
+    print(f"Construcción de tabla SLR(1) (en {segundos:.6f} segundos)")
 
     # --- FIN DE MEDICIONES ---
 
     # Fase 5: Informar al usuario y proceder con el análisis de cadenas.
     print("\n--- Resultados del Análisis de la Gramática ---")
-    if es_ll1:
-        print("La gramática es compatible con LL(1).")
-    else:
-        print("La gramática NO es compatible con LL(1).")
-    
-    if es_slr1:
-        print("La gramática es compatible con SLR(1).")
-    else:
-        print("La gramática NO es compatible con SLR(1).")
+    informar_compatibilidad('ll1', es_ll1)
+    informar_compatibilidad('slr1', es_slr1)
     print("--------------------------------------------\n")
 
     # Bucle principal de interacción con el usuario.
@@ -98,7 +100,7 @@ def main():
             if eleccion in ['T', 'B']:
                 analizador = analizador_ll1 if eleccion == 'T' else analizador_slr1
                 analizar_cadenas(analizador)
-    
+
     elif es_ll1:
         # Caso 2: Solo LL(1) está disponible.
         print("Usando el analizador LL(1).")
@@ -113,24 +115,237 @@ def main():
         # Caso 4: Ningún analizador es compatible.
         print("La gramática no es compatible con LL(1) ni con SLR(1). No se pueden analizar cadenas.")
 
-def analizar_cadenas(analizador):
+def main_selectivo(gramatica, tipo):
+    """
+    Construye y usa un único analizador, sin pagar la construcción del otro.
+
+    Args:
+        gramatica: La gramática ya parseada.
+        tipo (str): 'll1' o 'slr1'.
+    """
+    first_follow = calcular_first_follow(gramatica)
+    analizador, compatible, segundos = construir_analizador(tipo, gramatica, first_follow)
+    print(f"\nConstrucción de tabla {NOMBRES[tipo]} (en {segundos:.6f} segundos)")
+
+    print("\n--- Resultados del Análisis de la Gramática ---")
+    informar_compatibilidad(tipo, compatible)
+    print("--------------------------------------------\n")
+
+    if compatible:
+        print(f"Usando el analizador {NOMBRES[tipo]}.")
+        analizar_cadenas(analizador)
+    else:
+        print(f"La gramática no es compatible con {NOMBRES[tipo]}. No se pueden analizar cadenas.")
+
+def main_paralelo(gramatica):
+    """
+    Construye ambos analizadores a la vez, cada uno en su propio proceso.
+
+    Cada proceso calcula FIRST/FOLLOW, construye su tabla y la devuelve
+    empaquetada (ver `TablaCompartida.serializar`). Las cadenas se analizan con
+    el primer analizador compatible que esté listo, sobre su tabla empaquetada;
+    el otro sigue construyéndose en segundo plano y se informa de él cuando
+    termina. Al salir, la construcción pendiente se interrumpe. Si una
+    construcción falla, se lanza RuntimeError con la traza del proceso.
+
+    Args:
+        gramatica: La gramática ya parseada.
+    """
+    import multiprocessing
+    import queue
+
+    import TablaCompartida
+
+    resultados = multiprocessing.Queue()
+    procesos = {tipo: multiprocessing.Process(target=construir_en_proceso, args=(tipo, gramatica, resultados),
+                                              daemon=True)
+                for tipo in NOMBRES}
+    for proceso in procesos.values():
+        proceso.start()
+
+    def esperar():
+        """Espera el siguiente resultado, o falla si un proceso terminó sin enviarlo."""
+        while True:
+            try:
+                return resultados.get(timeout=0.5)
+            except queue.Empty:
+                for tipo, proceso in procesos.items():
+                    if proceso.exitcode not in (None, 0):
+                        raise RuntimeError(f"La construcción de {NOMBRES[tipo]} terminó con "
+                                           f"código {proceso.exitcode}.")
+
+    def recibir(tipo, compatible, segundos, datos):
+        """Informa de un analizador terminado y devuelve su tabla si es compatible."""
+        procesos.pop(tipo).join()
+        if compatible is None:
+            raise RuntimeError(f"Falló la construcción de {NOMBRES[tipo]} en segundo plano:\n{datos}")
+        print(f"\nConstrucción de {NOMBRES[tipo]} en segundo plano (en {segundos:.6f} segundos, "
+              f"listo a los {time.perf_counter() - _INICIO:.6f} segundos del arranque)")
+        informar_compatibilidad(tipo, compatible)
+        return TablaCompartida.desde_buffer(datos) if compatible else None
+
+    def informar_terminados():
+        """Informa de las construcciones en segundo plano que ya terminaron."""
+        while procesos:
+            try:
+                recibir(*resultados.get_nowait())
+            except queue.Empty:
+                return
+
+    try:
+        analizador = None
+        while analizador is None and procesos:
+            tipo, compatible, segundos, datos = esperar()
+            analizador = recibir(tipo, compatible, segundos, datos)
+
+        if analizador is None:
+            print("La gramática no es compatible con LL(1) ni con SLR(1). No se pueden analizar cadenas.")
+            return
+        print(f"\nUsando el analizador {NOMBRES[tipo]} (el primero en estar listo).")
+        analizar_cadenas(analizador, antes_de_leer=informar_terminados)
+        informar_terminados()
+    finally:
+        for proceso in procesos.values():
+            proceso.terminate()
+            proceso.join()
+
+def construir_en_proceso(tipo, gramatica, resultados):
+    """
+    Construye un analizador en un proceso aparte y envía su tabla empaquetada.
+
+    Args:
+        tipo (str): 'll1' o 'slr1'.
+        gramatica: La gramática a analizar.
+        resultados (multiprocessing.Queue): Recibe (tipo, compatible, segundos, datos),
+            donde `datos` es la tabla serializada, o None si no es compatible. Si la
+            construcción falla, `compatible` es None y `datos` la traza del error.
+    """
+    import traceback
+
+    import TablaCompartida
+
+    inicio = time.perf_counter()
+    try:
+        # Los mensajes de la construcción no se mezclan con los del proceso principal.
+        first_follow = calcular_first_follow(gramatica, informar=False)
+        analizador, compatible, _ = construir_analizador(tipo, gramatica, first_follow,
+                                                         mostrar_conflictos=False)
+        datos = TablaCompartida.serializar(analizador.comprimir_tabla()) if compatible else None
+    except Exception:
+        # Sin un resultado, el proceso principal esperaría indefinidamente.
+        resultados.put((tipo, None, time.perf_counter() - inicio, traceback.format_exc()))
+        return
+    resultados.put((tipo, compatible, time.perf_counter() - inicio, datos))
+
+def calcular_first_follow(gramatica, informar=True):
+    """
+    Calcula los conjuntos FIRST y FOLLOW, informando del tiempo de cada uno.
+
+    Args:
+        gramatica: La gramática a analizar.
+        informar (bool, opcional): Si es False, no se imprimen los tiempos.
+
+    Returns:
+        First_Follow: Los conjuntos calculados.
+    """
+    from First_Follow import First_Follow
+
+    first_follow = First_Follow(gramatica)
+
+    # Medición de FIRST
+    start_time_first = time.perf_counter()
+    first_follow.calcular_first()
+    end_time_first = time.perf_counter()
+    if informar:
+        print(f"\nCálculo de FIRST (en {end_time_first - start_time_first:.6f} segundos)")
+
+    # Medición de FOLLOW
+    start_time_follow = time.perf_counter()
+    first_follow.calcular_follow()
+    end_time_follow = time.perf_counter()
+    if informar:
+        print(f"Cálculo de FOLLOW (en {end_time_follow - start_time_follow:.6f} segundos)")
+    return first_follow
+
+def construir_analizador(tipo, gramatica, first_follow, mostrar_conflictos=True):
+    """
+    Construye un analizador, importando su módulo solo en este momento.
+
+    Args:
+        tipo (str): 'll1' o 'slr1'.
+        gramatica: La gramática a analizar.
+        first_follow: Los conjuntos FIRST y FOLLOW ya calculados.
+        mostrar_conflictos (bool, opcional): Si es False, los conflictos SLR(1)
+            no se imprimen.
+
+    Returns:
+        tuple: (analizador, compatible, segundos), donde `compatible` indica si
+        la tabla se construyó sin conflictos y `segundos` lo que tardó.
+    """
+    if tipo == 'll1':
+        from AnalizadorLL1 import AnalizadorLL1
+        analizador = AnalizadorLL1(gramatica, first_follow)
+        opciones = {}
+    else:
+        from AnalizadorSLR1 import AnalizadorSLR1
+        analizador = AnalizadorSLR1(gramatica, first_follow)
+        opciones = {'mostrar_conflictos': mostrar_conflictos}
+
+    inicio = time.perf_counter()
+    compatible = analizador.construir_tabla_analisis(**opciones)
+    return analizador, compatible, time.perf_counter() - inicio
+
+def informar_compatibilidad(tipo, compatible):
+    """Informa si la gramática es compatible con un tipo de analizador."""
+    if compatible:
+        print(f"La gramática es compatible con {NOMBRES[tipo]}.")
+    else:
+        print(f"La gramática NO es compatible con {NOMBRES[tipo]}.")
+
+def parsear_argumentos(argv):
+    """Lee las opciones del modo de arranque."""
+    parser = argparse.ArgumentParser(description="Analizador sintáctico LL(1) y SLR(1).")
+    modo = parser.add_mutually_exclusive_group()
+    modo.add_argument('--analizador', choices=['ambos', 'll1', 'slr1'], default='ambos',
+                      help="construir solo el analizador indicado")
+    modo.add_argument('--paralelo', action='store_true',
+                      help="construir ambos en procesos separados y usar el primero listo")
+    return parser.parse_args(argv)
+
+def analizar_cadenas(analizador, antes_de_leer=None):
     """
     Recibe un analizador y entra en un bucle para analizar cadenas.
 
     Args:
-        analizador: Una instancia de AnalizadorLL1 o AnalizadorSLR1.
+        analizador: Una instancia de AnalizadorLL1 o AnalizadorSLR1 (o su tabla
+            empaquetada, que también ofrece `analizar`).
+        antes_de_leer (callable, opcional): Se invoca antes de pedir cada cadena.
     """
     while True:
+        if antes_de_leer is not None:
+            antes_de_leer()
         linea = input("Introduce una cadena para analizar (o presiona Enter para volver): ").strip()
         if not linea:
             break
-        
+
         # --- MEDICIÓN ELIMINADA DE ESTA SECCIÓN ---
         resultado = analizador.analizar(linea)
-        
+
         # Se revierte a la impresión original
         print("Resultado:", "si" if resultado else "no")
+        informar_primer_veredicto()
     print("-" * 20)
 
+def informar_primer_veredicto():
+    """
+    Informa, una sola vez, del tiempo desde el arranque hasta el primer veredicto.
+
+    Se escribe en la salida de error para no alterar la salida del análisis.
+    """
+    global _primer_veredicto
+    if _primer_veredicto is None:
+        _primer_veredicto = time.perf_counter() - _INICIO
+        print(f"Tiempo hasta el primer veredicto: {_primer_veredicto:.6f} segundos", file=sys.stderr)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()